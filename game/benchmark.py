@@ -0,0 +1,243 @@
+"""
+Time the simulation and autopilot hot paths and compare them against a saved baseline.
+
+Each case lays a snake of a given length along a serpentine path on a grid of
+a given size, then times one call of the operation in a loop. Results are the
+best per-call time over several repeats, so runs on the same machine are
+comparable.
+
+Usage (from the game folder):
+    python benchmark.py --save baseline.json
+    python benchmark.py --baseline baseline.json --threshold 10
+    python benchmark.py --grids 20x20,100x100 --lengths 0.5 --filter bfs
+"""
+
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+
+
+# Local
+from scripts.collision_detection import CollisionDetection
+from scripts.hamiltonian import HamiltonianCycle
+from scripts.pathfinding import Pathfinding
+from scripts.simulation import SnakeBody, FoodSpawner
+
+
+#endregion
+################################################################################
+#region Cases
+
+
+DEFAULT_GRIDS = "20x20,36x24,100x100"
+# Snake length as a share of the board, from a lone head to a nearly full board
+DEFAULT_LENGTHS = "0,0.25,0.5,0.9"
+
+
+def grow_along_cycle(snake, length):
+    """Grow a snake to the given length by moving it forward along a serpentine Hamiltonian cycle."""
+    cycle = HamiltonianCycle(snake.grid_width, snake.grid_height)
+    start = cycle.index(snake.head())
+    for step in range(1, length - len(snake.body) + 1):
+        cell = cycle.cells[(start + step) % cycle.size]
+        head = snake.head()
+        snake.direction = (cell % cycle.width - head[0], cell // cycle.width - head[1])
+        snake.grow()
+        snake.move()
+    snake.direction = cycle.next_direction(snake.head())
+    return snake
+
+
+def build_snake(width, height, length):
+    """Return a snake of the given length laid along a serpentine path, with the head at the end."""
+    return grow_along_cycle(SnakeBody(start=(0, 0), grid_width=width, grid_height=height), length)
+
+
+def far_free_cell(snake):
+    """Return the free cell farthest from the head, as a stable food position."""
+    head = snake.body[0]
+    best = None
+    best_distance = -1
+    for y in range(snake.grid_height):
+        for x in range(snake.grid_width):
+            distance = abs(x - head[0]) + abs(y - head[1])
+            if distance > best_distance and not snake.occupies((x, y)):
+                best, best_distance = (x, y), distance
+    return best
+
+
+def bench_move(snake, collision_detector, food_position):
+    # Wrapping keeps the snake on the grid however many times it moves
+    return lambda: snake.move(True)
+
+
+def bench_self_collision(snake, collision_detector, food_position):
+    return lambda: collision_detector.check_self_collision(snake)
+
+
+def bench_random_position(snake, collision_detector, food_position):
+    food = FoodSpawner(snake, random.Random(0))
+    return lambda: food.random_position(snake)
+
+
+def bench_bfs(snake, collision_detector, food_position):
+    pathfinding = Pathfinding(snake, collision_detector)
+    return lambda: pathfinding._bfs(snake.body[0], food_position)
+
+
+def bench_flood_fill(snake, collision_detector, food_position):
+    pathfinding = Pathfinding(snake, collision_detector)
+    head = snake.body[0]
+    start = (head[0] + snake.direction[0], head[1] + snake.direction[1])
+    return lambda: pathfinding._flood_fill(start)
+
+
+def bench_next_direction(snake, collision_detector, food_position):
+    pathfinding = Pathfinding(snake, collision_detector)
+
+    def decide():
+        # Drop the cached plan so every call is a full decision
+        pathfinding._plan = []
+        return pathfinding.get_next_direction(food_position)
+    return decide
+
+
+CASES = {
+    "snake.move": bench_move,
+    "collision.check_self_collision": bench_self_collision,
+    "food.random_position": bench_random_position,
+    "pathfinding.bfs": bench_bfs,
+    "pathfinding.flood_fill": bench_flood_fill,
+    "pathfinding.get_next_direction": bench_next_direction,
+}
+
+
+#endregion
+################################################################################
+#region Timing
+
+
+def time_call(function, repeat=5):
+    """Return the best time per call in seconds, looping enough calls to take about 0.2 seconds per repeat."""
+    timer = timeit.Timer(function)
+    number, _elapsed = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run_benchmarks(grids, lengths, name_filter=None, repeat=5):
+    """Time every case on every grid and snake length, returning {case key: seconds per call}."""
+    results = {}
+    for width, height in grids:
+        collision_detector = CollisionDetection(width, height)
+        cells = width * height
+        for share in lengths:
+            length = min(cells - 1, max(1, int(share * cells)))
+            for name, build in CASES.items():
+                key = f"{name}[{width}x{height},len={length}]"
+                if name_filter and name_filter not in key:
+                    continue
+                # Each case gets a fresh snake, since some of them move it
+                snake = build_snake(width, height, length)
+                food_position = far_free_cell(snake)
+                results[key] = time_call(build(snake, collision_detector, food_position), repeat)
+                print(f"{key:<60} {results[key] * 1e6:12.3f} us", file=sys.stderr)
+    return results
+
+
+#endregion
+################################################################################
+#region Report
+
+
+def compare(baseline, results, threshold):
+    """
+    Return a report of the current results against a baseline, and whether anything regressed.
+
+    A case regresses when it is more than threshold percent slower than the baseline.
+    """
+    lines = [f"{'case':<60} {'baseline us':>12} {'current us':>12} {'change':>9}"]
+    regressed = False
+    for key, seconds in results.items():
+        if key not in baseline:
+            lines.append(f"{key:<60} {'-':>12} {seconds * 1e6:12.3f} {'new':>9}")
+            continue
+        change = (seconds / baseline[key] - 1) * 100
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        elif change < -threshold:
+            flag = "  faster"
+        lines.append(f"{key:<60} {baseline[key] * 1e6:12.3f} {seconds * 1e6:12.3f} {change:+8.1f}%{flag}")
+    return "\n".join(lines), regressed
+
+
+def parse_grid(text):
+    """Parse a grid size written as WIDTHxHEIGHT."""
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+#endregion
+################################################################################
+#region Main
+
+
+def parse_args(argv=None):
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description="Time the simulation and autopilot hot paths.")
+    parser.add_argument("--grids", default=DEFAULT_GRIDS, help="comma separated grid sizes, each WIDTHxHEIGHT with an even side")
+    parser.add_argument("--lengths", default=DEFAULT_LENGTHS, help="comma separated snake lengths as a share of the board")
+    parser.add_argument("--filter", default=None, help="only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per case, the best is kept")
+    parser.add_argument("--save", default=None, help="file to save the results to")
+    parser.add_argument("--baseline", default=None, help="saved results to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+    try:
+        args.grid_sizes = [parse_grid(grid) for grid in args.grids.split(",")]
+    except ValueError:
+        parser.error(f"--grids must be comma separated WIDTHxHEIGHT sizes, got {args.grids!r}")
+    for width, height in args.grid_sizes:
+        if not HamiltonianCycle.exists(width, height):
+            parser.error(f"No Hamiltonian cycle exists on a {width}x{height} grid, --grids sizes need an even side")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    lengths = [float(length) for length in args.lengths.split(",")]
+    results = run_benchmarks(args.grid_sizes, lengths, args.filter, args.repeat)
+    if args.save:
+        data = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "results": results,
+        }
+        with open(args.save, 'w') as f:
+            json.dump(data, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)["results"]
+        report, regressed = compare(baseline, results, args.threshold)
+        print(report)
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
+
+
+#endregion
@@ -0,0 +1,183 @@
+"""
+Render scripted game states with SDL's dummy video driver and report the frame cost.
+
+Every scenario is rendered with each theme from Theme.get_themes() through
+MainGame.render, and the report lists frames per second and the mean time of
+each render phase (background, snake, text, flip).
+
+Usage (from the game folder):
+    python frame_benchmark.py
+    python frame_benchmark.py --frames 500 --scenarios menu,playing --format json --output frames.json
+    python frame_benchmark.py --render-mode dirty
+"""
+
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import argparse
+import json
+import os
+import sys
+
+
+# Render off screen, before pygame is first imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+# Third Party
+import pygame
+
+
+# Local
+from main import MainGame
+from benchmark import grow_along_cycle
+from scripts.gamestate import GameState
+from scripts.constants import GRID_WIDTH, GRID_HEIGHT
+
+
+#endregion
+################################################################################
+#region Scenarios
+
+
+PHASES = ["background", "snake", "text", "flip"]
+# Length of the snake in the play, pause and game over scenarios, as a share of the board
+LONG_SNAKE_SHARE = 0.6
+
+
+def setup_menu(game):
+    """Show the main menu with the demo game running behind it."""
+    game.current_state = GameState.MENU
+
+
+def setup_playing(game):
+    """Show a long snake in play."""
+    grow_along_cycle(game.snake, int(GRID_WIDTH * GRID_HEIGHT * LONG_SNAKE_SHARE))
+    game.food.respawn(game.snake)
+    game.current_state = GameState.PLAYING
+
+
+def setup_paused(game):
+    """Show the pause menu over a long snake."""
+    setup_playing(game)
+    game.current_state = GameState.PAUSED
+
+
+def setup_game_over(game):
+    """Show the game over screen with a new high score."""
+    game.score.score = int(GRID_WIDTH * GRID_HEIGHT * LONG_SNAKE_SHARE)
+    game.game_over.set_high_score_status(True)
+    game.current_state = GameState.GAME_OVER
+
+
+SCENARIOS = {
+    "menu": setup_menu,
+    "playing": setup_playing,
+    "paused": setup_paused,
+    "game_over": setup_game_over,
+}
+
+
+#endregion
+################################################################################
+#region Benchmark
+
+
+def apply_theme(game, theme_index):
+    """Switch every drawn object to a theme."""
+    game.set_theme(theme_index)
+    game.menu.selected_theme_index = theme_index
+    game.snake.theme = game.current_theme
+    game.food.theme = game.current_theme
+
+
+def run_scenario(game, scenario, theme_index, frames, warmup=10):
+    """Render one scenario with one theme and return the mean seconds per phase and the frame rate."""
+    game.initialize_game()
+    apply_theme(game, theme_index)
+    SCENARIOS[scenario](game)
+    timer = game.frame_timer
+    for frame in range(warmup + frames):
+        if frame == warmup:
+            timer.reset()
+        if game.current_state == GameState.MENU:
+            game.demo_game.update()
+        timer.start_frame()
+        game.render()
+        timer.end_frame()
+        pygame.event.pump()
+    averages = timer.averages()
+    result = {phase: averages.get(phase, 0.0) for phase in PHASES}
+    result["frame"] = averages["frame"]
+    result["fps"] = 1.0 / averages["frame"] if averages["frame"] else 0.0
+    return result
+
+
+def run_benchmark(scenarios, frames, render_mode="full"):
+    """Render every scenario with every theme and return one result row per pair."""
+    game = MainGame(play_music=False)
+    game.render_mode = render_mode
+    rows = []
+    for scenario in scenarios:
+        for theme_index, theme in enumerate(game.themes):
+            result = run_scenario(game, scenario, theme_index, frames)
+            rows.append({"scenario": scenario, "theme": theme.name} | result)
+            print(format_row(rows[-1]), file=sys.stderr)
+    game.close_games()
+    return rows
+
+
+#endregion
+################################################################################
+#region Report
+
+
+def format_header():
+    return f"{'scenario':<10} {'theme':<10} {'fps':>8} " + " ".join(f"{phase + ' ms':>10}" for phase in PHASES)
+
+
+def format_row(row):
+    phases = " ".join(f"{row[phase] * 1000:10.3f}" for phase in PHASES)
+    return f"{row['scenario']:<10} {row['theme']:<10} {row['fps']:8.1f} {phases}"
+
+
+def parse_args(argv=None):
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description="Render scripted game states off screen and report the frame cost.")
+    parser.add_argument("--frames", type=int, default=200, help="frames to render per scenario and theme")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated scenarios: " + ", ".join(SCENARIOS))
+    parser.add_argument("--render-mode", choices=["full", "dirty", "grid"], default="full", help="redraw the whole screen, only the changed cells, or the board through a grid sized framebuffer")
+    parser.add_argument("--format", choices=["table", "json"], default="table", help="report format")
+    parser.add_argument("--output", default=None, help="file to write the report to (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = args.scenarios.split(",")
+    for scenario in scenarios:
+        if scenario not in SCENARIOS:
+            sys.exit(f"Unknown scenario: {scenario!r} (available: {', '.join(SCENARIOS)})")
+    print(format_header(), file=sys.stderr)
+    rows = run_benchmark(scenarios, args.frames, args.render_mode)
+    if args.format == "json":
+        report = json.dumps(rows, indent=2)
+    else:
+        report = "\n".join([format_header()] + [format_row(row) for row in rows])
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
+
+
+#endregion
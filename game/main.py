@@ -5,6 +5,16 @@
 #region Imports
 
 
+# Standard Library
+import sys
+import time
+import threading
+
+
+# Startup is timed from here, so the trace includes the imports below
+STARTED = time.perf_counter()
+
+
 # Third Party
 import pygame
 
@@ -14,27 +24,23 @@ from scripts.constants import *
 from scripts.food import Food
 from scripts.theme import Theme
 from scripts.snake import Snake
-from scripts.demo import DemoGame, Pathfinding
+from scripts.demo import DemoGame
+from scripts.navigation import create_strategy
 from scripts.draw_text import draw_text
 from scripts.game_score import GameScore
 from scripts.collision_detection import CollisionDetection
 from scripts.gamestate import GameState, Difficulty, MainMenu, PlayingGame, PauseMenu, GameOver, GameMode
-from scripts.sound_manager import SoundManager
-
-
-#endregion
-################################################################################
-#region Setup
-
-
-# Initialize Pygame
-pygame.init()
-
-
-# Initialize screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Snake Game")
-clock = pygame.time.Clock()
+from scripts.sound_manager import SoundManager, MUSIC_END_EVENT
+from scripts.frame_timing import FrameTimer
+from scripts.layers import StaticLayers
+from scripts.dirty_rects import CellDiff
+from scripts.cell_atlas import CELL_ATLAS
+from scripts.grid_renderer import GridRenderer
+from scripts.fixed_timestep import FixedTimestep
+from scripts.startup_trace import StartupTrace
+from scripts.perf_overlay import PerfOverlay
+from scripts.profiler import LoopProfiler
+from scripts import metrics
 
 
 #endregion
@@ -43,43 +49,95 @@ clock = pygame.time.Clock()
 
 
 class MainGame:
-    def __init__(self):
+    def __init__(self, play_music=True, startup_trace=None):
+        self.startup_trace = startup_trace or StartupTrace()
+        # Only the subsystems the first frame needs, audio starts in the background
+        pygame.display.init()
+        pygame.font.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Snake Game")
         self.clock = pygame.time.Clock()
+        self.startup_trace.lap("display")
         self.themes = Theme.get_themes()
         self.current_theme_index = 0
         self.current_theme = self.themes[self.current_theme_index]
         self.score = GameScore()
-        self.demo_game = DemoGame(self.current_theme, score=self.score)
+        self.demo_game = None
         self.base_fps = BASE_FPS
         self.game_speed_string = f"Speed: +0%"
         self.difficulty = Difficulty.MEDIUM
-        self.sound_manager = SoundManager()
-        self.sound_manager.start_music()
+        self.sound_manager = None
+        if play_music:
+            self.start_music()
+        self.frame_timer = FrameTimer(PERF_HISTORY_FRAMES)
+        self.layers = StaticLayers(self.current_theme)
+        self.render_mode = RENDER_MODE
+        self.cell_diff = CellDiff()
+        self.grid_renderer = GridRenderer()
+        self.last_render_key = None
+        self.last_hud = None
+        self.loop_mode = LOOP_MODE
+        self.render_fps = RENDER_FPS
+        self.interpolate = INTERPOLATE
+        self.timestep = FixedTimestep(self.base_fps)
+        self.perf_overlay = PerfOverlay(self.frame_timer)
+        self.metrics_sinks = metrics.create_sinks(METRICS_FILE, METRICS_PORT)
+        self.last_metrics_publish = time.perf_counter()
+        # Keys are only read once per frame, so one pressed during the wait is stamped with its start
+        self.input_wait_started = None
+        self.profiler = LoopProfiler(PROFILE_PATH)
         self.autopilot_enabled = False
         self.navigation_handler = None
         self.playing_game = None
         self.game_mode = GameMode.CLASSIC
+        self.startup_trace.lap("setup")
         self.initialize_game()
+        self.startup_trace.lap("initialize_game")
+
+
+    def start_music(self):
+        """Set up audio and start the music on a background thread, so it does not delay the first frame."""
+        def start():
+            started = time.perf_counter()
+            try:
+                sound_manager = SoundManager()
+                sound_manager.start_music()
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Music disabled: {e}")
+                return
+            self.sound_manager = sound_manager
+            self.startup_trace.record_background("audio", time.perf_counter() - started)
+        threading.Thread(target=start, name="audio-startup", daemon=True).start()
 
 
     def initialize_game(self):
         self.current_theme = self.themes[self.current_theme_index]
+        self.layers.set_theme(self.current_theme)
         self.snake = Snake(self.current_theme)
         self.food = Food(self.current_theme, self.snake)
         self.collision_detector = CollisionDetection(GRID_WIDTH, GRID_HEIGHT)
-        self.menu = MainMenu(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.menu = MainMenu(SCREEN_WIDTH, SCREEN_HEIGHT, self.themes)
         self.menu.selected_theme_index = self.current_theme_index
         self.pause_menu = PauseMenu(SCREEN_WIDTH, SCREEN_HEIGHT)
         self.game_over = GameOver(SCREEN_WIDTH, SCREEN_HEIGHT)
         self.current_state = GameState.MENU
+        self.close_games()
         self.demo_game = DemoGame(self.current_theme, score=self.score)
         self.score.reset()
-        self.navigation_handler = Pathfinding(self.snake, self.collision_detector)
+        self.navigation_handler = create_strategy(AUTOPILOT_STRATEGY, self.snake, self.collision_detector)
         self.autopilot_enabled = False
         self.playing_game = PlayingGame(self.snake, self.food, self.collision_detector, self.score)
         self.playing_game.set_game_mode(self.game_mode)
         self.playing_game.set_navigation_handler(self.navigation_handler)
+        self.playing_game.set_background_planning(AUTOPILOT_BACKGROUND)
+
+
+    def close_games(self):
+        """Stop the background workers of the current demo and playing games."""
+        if self.demo_game:
+            self.demo_game.close()
+        if self.playing_game:
+            self.playing_game.close()
 
 
 # --------------------------------------
@@ -96,10 +154,17 @@ class MainGame:
         """
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                self.sound_manager.stop_music()
+                if self.sound_manager:
+                    self.sound_manager.stop_music()
+                self.close_games()
                 return False
-            if event.type == pygame.USEREVENT + 1:  # Music end event
+            if event.type == MUSIC_END_EVENT and self.sound_manager:
                 self.sound_manager.handle_music_end()
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.last_render_key = None
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_F3, pygame.K_F4, pygame.K_F5):
+                self.handle_perf_overlay_input(event)
+                continue
             if self.current_state == GameState.MENU:
                 self.handle_main_menu_input(event)
             elif self.current_state == GameState.PLAYING:
@@ -111,14 +176,25 @@ class MainGame:
         return True
 
 
+    def handle_perf_overlay_input(self, event):
+        if event.key == pygame.K_F3:
+            self.perf_overlay.toggle()
+        elif event.key == pygame.K_F4:
+            path = self.perf_overlay.dump_csv()
+            if path is not None:
+                print(f"Frame times written to {path}")
+        elif event.key == pygame.K_F5:
+            profile_path = self.profiler.toggle()
+            if profile_path:
+                print(f"Profile written to {profile_path}")
+
+
     def handle_main_menu_input(self, event):
         new_state, theme_index, difficulty = self.menu.handle_input(event)
         if new_state is None:  # Game was exited
             return
         if theme_index != self.current_theme_index:
-            self.current_theme_index = theme_index
-            self.current_theme = self.themes[self.current_theme_index]
-            self.demo_game.update_theme(self.current_theme)
+            self.set_theme(theme_index)
         if difficulty != self.difficulty:
             self.difficulty = difficulty
         if new_state != self.current_state:
@@ -127,8 +203,16 @@ class MainGame:
         self.current_state = new_state
 
 
+    def set_theme(self, theme_index):
+        """Switch to a theme, redrawing the static layers in its colors."""
+        self.current_theme_index = theme_index
+        self.current_theme = self.themes[self.current_theme_index]
+        self.demo_game.update_theme(self.current_theme)
+        self.layers.set_theme(self.current_theme)
+
+
     def handle_game_movement_input(self, event):
-        new_state = self.playing_game.handle_input(event)
+        new_state = self.playing_game.handle_input(event, self.input_wait_started)
         if new_state != self.current_state:
             self.current_state = new_state
 
@@ -157,10 +241,21 @@ class MainGame:
 
         Call this method once per frame to update the game state and logic.
         """
+        decision_budget = self.get_decision_budget()
         if self.current_state == GameState.MENU:
+            self.demo_game.decision_budget = decision_budget
             self.demo_game.update()
+            self.record_tick_metrics(self.demo_game)
         elif self.current_state == GameState.PLAYING:
+            self.playing_game.decision_budget = decision_budget
             self.handle_game_logic()
+            self.record_tick_metrics(self.playing_game)
+
+
+    def record_tick_metrics(self, game):
+        metrics.TICKS.inc()
+        if game.decision_time is not None:
+            metrics.PATHFINDING_SECONDS.observe(game.decision_time)
 
 
     def handle_game_logic(self):
@@ -178,12 +273,112 @@ class MainGame:
         """
         Render the game visuals.
 
-        Call this method once per frame to render the game visuals.
+        Call this method once per frame to render the game visuals. Each phase is
+        timed by frame_timer (background, text, snake, overlay, flip).
+
+        In the "dirty" render mode only the cells and HUD that changed since the
+        last frame are redrawn and pushed to the display, and the snake gradient
+        is only repainted in full once it has drifted by a band (see CellDiff).
+        The whole screen is still redrawn when the state, theme or menu selection
+        changes, while the performance overlay is shown, and on any frame with
+        changes under the menu or pause text.
         """
+        self.frame_timer.mark()
+        if self.render_mode == "dirty" and not self.perf_overlay.enabled and self.get_render_key() == self.last_render_key:
+            if self.render_dirty():
+                return
         self.draw_game_display()
-        self.draw_game_speed()
         self.draw_current_state()
+        if self.perf_overlay.enabled:
+            self.draw_perf_overlay()
+            self.frame_timer.lap("overlay")
         pygame.display.flip()
+        self.frame_timer.lap("flip")
+        if self.render_mode == "dirty":
+            self.last_render_key = self.get_render_key()
+            self.last_hud = self.get_hud_key()
+            self.cell_diff.reset(self.get_cell_kinds(self.get_cell_colors()))
+
+
+    def render_dirty(self):
+        """
+        Redraw and push only the cells and HUD that changed since the last frame.
+
+        Returns False, without drawing, when the menu or pause text needs a full
+        redraw instead. That text blends into what is under it, so drawing it
+        again over each changed rect would thicken it wherever the rects leave
+        it untouched, and would cost a full text draw per rect.
+        """
+        rects = []
+        colors = self.get_cell_colors()
+        changes = self.cell_diff.changes(self.get_cell_kinds(colors), colors)
+        hud = self.get_hud_key()
+        if self.current_state in (GameState.MENU, GameState.PAUSED) and (changes or hud != self.last_hud):
+            return False
+        for (x, y), color in changes:
+            rect = pygame.Rect(x * CELL_SIZE + BORDER_THICKNESS, y * CELL_SIZE + BORDER_THICKNESS, CELL_SIZE, CELL_SIZE)
+            self.screen.set_clip(rect)
+            if color is None:
+                self.layers.blit(self.screen, "background", self.draw_background, opaque=True)
+            else:
+                pygame.draw.rect(self.screen, color, rect)
+            rects.append(rect)
+        self.frame_timer.lap("snake")
+        if hud != self.last_hud:
+            self.last_hud = hud
+            rect = pygame.Rect(0, 0, SCREEN_WIDTH, BORDER_THICKNESS)
+            self.screen.set_clip(rect)
+            self.layers.blit(self.screen, "background", self.draw_background, opaque=True)
+            self.score.draw(self.screen, 50, BORDER_THICKNESS // 2)
+            self.draw_game_speed()
+            rects.append(rect)
+        self.screen.set_clip(None)
+        self.frame_timer.lap("text")
+        if rects:
+            pygame.display.update(rects)
+        self.frame_timer.lap("flip")
+        return True
+
+
+    def get_render_key(self):
+        """Return what forces a full redraw when it changes: the state, theme, menu selection and performance overlay."""
+        menu = self.menu
+        selection = (menu.selected_option, menu.selected_mode, menu.selected_difficulty, menu.selected_theme_index)
+        return self.current_state, self.current_theme, selection, self.game_over.is_high_score, self.screen.get_size(), self.perf_overlay.enabled
+
+
+    def get_hud_key(self):
+        return self.score.score, self.game_speed_string
+
+
+    def get_board(self):
+        """Return the snake and food shown in the current state, or (None, None) if the board is hidden."""
+        if self.current_state == GameState.MENU:
+            return self.demo_game.snake, self.demo_game.food
+        if self.current_state in (GameState.PLAYING, GameState.PAUSED):
+            return self.snake, self.food
+        return None, None
+
+
+    def get_cell_colors(self):
+        """Return the {position: color} of every grid cell drawn in the current state."""
+        colors = {}
+        snake, food = self.get_board()
+        if snake is not None:
+            snake.cell_colors(colors)
+            food.cell_colors(colors)
+        return colors
+
+
+    def get_cell_kinds(self, colors):
+        """Return the {position: kind} of the cells in get_cell_colors, where kind is "head", "body" or "food"."""
+        kinds = dict.fromkeys(colors, "body")
+        snake, food = self.get_board()
+        if snake is not None:
+            kinds[snake.body[0]] = "head"
+            if food.position is not None:
+                kinds[food.position] = "food"
+        return kinds
 
 
     def draw_game_speed(self):
@@ -191,29 +386,80 @@ class MainGame:
 
 
     def draw_game_display(self):
-        self.screen.fill(self.current_theme.background_color)
-        self.draw_screen_border()
+        self.layers.blit(self.screen, "background", self.draw_background, opaque=True)
+        self.frame_timer.lap("background")
         self.score.draw(self.screen, 50, BORDER_THICKNESS // 2)
+        self.draw_game_speed()
+        self.frame_timer.lap("text")
+
+
+    def draw_background(self, surface):
+        surface.fill(self.current_theme.background_color)
+        self.draw_screen_border(surface)
 
 
-    def draw_screen_border(self):
+    def draw_screen_border(self, surface):
         # Top, Bottom, Left, Right
-        pygame.draw.rect(self.screen, self.current_theme.border_color, pygame.Rect(0, 0, SCREEN_WIDTH, BORDER_THICKNESS))
-        pygame.draw.rect(self.screen, self.current_theme.border_color, pygame.Rect(0, SCREEN_HEIGHT - BORDER_THICKNESS, SCREEN_WIDTH, BORDER_THICKNESS))
-        pygame.draw.rect(self.screen, self.current_theme.border_color, pygame.Rect(0, 0, BORDER_THICKNESS, SCREEN_HEIGHT))
-        pygame.draw.rect(self.screen, self.current_theme.border_color, pygame.Rect(SCREEN_WIDTH - BORDER_THICKNESS, 0, BORDER_THICKNESS, SCREEN_HEIGHT))
+        pygame.draw.rect(surface, self.current_theme.border_color, pygame.Rect(0, 0, SCREEN_WIDTH, BORDER_THICKNESS))
+        pygame.draw.rect(surface, self.current_theme.border_color, pygame.Rect(0, SCREEN_HEIGHT - BORDER_THICKNESS, SCREEN_WIDTH, BORDER_THICKNESS))
+        pygame.draw.rect(surface, self.current_theme.border_color, pygame.Rect(0, 0, BORDER_THICKNESS, SCREEN_HEIGHT))
+        pygame.draw.rect(surface, self.current_theme.border_color, pygame.Rect(SCREEN_WIDTH - BORDER_THICKNESS, 0, BORDER_THICKNESS, SCREEN_HEIGHT))
 
 
     def draw_current_state(self):
+        timer = self.frame_timer
         if self.current_state == GameState.MENU:
-            self.demo_game.draw(self.screen)
-            self.menu.draw(self.screen)
+            self.draw_board()
+            timer.lap("snake")
+            self.draw_state_overlay()
+            timer.lap("text")
         elif self.current_state == GameState.PLAYING:
-            self.playing_game.draw(self.screen)
+            self.draw_board()
+            timer.lap("snake")
         elif self.current_state == GameState.PAUSED:
-            self.pause_menu.draw(self.screen, self.snake, self.food)
+            self.draw_board()
+            timer.lap("snake")
+            self.draw_state_overlay()
+            timer.lap("text")
         elif self.current_state == GameState.GAME_OVER:
-            self.game_over.draw(self.screen, self.score)
+            self.layers.blit(self.screen, "game_over", self.game_over.draw_static)
+            self.game_over.draw_dynamic(self.screen, self.score)
+            timer.lap("text")
+
+
+    def draw_board(self):
+        """Draw the snake and food of the current state, through the grid framebuffer in the "grid" render mode."""
+        snake, food = self.get_board()
+        if self.render_mode == "grid":
+            self.grid_renderer.draw(self.screen, snake, food, self.current_theme.background_color)
+        else:
+            CELL_ATLAS.draw(self.screen, snake, food)
+        # The dirty render mode only tracks whole cells, so it draws without interpolation
+        if self.loop_mode == "fixed" and self.interpolate and self.render_mode != "dirty" and self.current_state != GameState.PAUSED:
+            CELL_ATLAS.draw_motion(self.screen, snake, self.timestep.alpha(), self.current_theme.background_color)
+
+
+    def draw_state_overlay(self):
+        """Draw the menu text that sits on top of the board in the menu and pause states."""
+        if self.current_state == GameState.MENU:
+            self.layers.blit(self.screen, "menu", self.menu.draw_static)
+            self.menu.draw_dynamic(self.screen)
+        elif self.current_state == GameState.PAUSED:
+            self.layers.blit(self.screen, "pause", self.pause_menu.draw_overlay)
+
+
+    def draw_perf_overlay(self):
+        if self.current_state == GameState.MENU:
+            game = self.demo_game
+            input_stats = None
+        else:
+            game = self.playing_game
+            input_stats = game.turn_queue.stats()
+        if self.loop_mode == "fixed":
+            target_fps, timestep_stats = self.render_fps, self.timestep.stats()
+        else:
+            target_fps, timestep_stats = self.get_current_speed(), None
+        self.perf_overlay.draw(self.screen, self.clock.get_fps(), target_fps, game.decision_time, len(game.snake.body), timestep_stats, input_stats)
 
 
 #endregion
@@ -230,13 +476,66 @@ class MainGame:
         return int(self.base_fps * speed_multiplier)
 
 
+    def get_decision_budget(self):
+        """Return the seconds the autopilot may spend on one move at the current speed."""
+        return AUTOPILOT_FRAME_BUDGET / self.get_current_speed()
+
+
     def gameloop(self):
+        if PROFILE_PATH:
+            self.profiler.start()
         running = True
-        while running:
-            running = self.handle_input_events()
+        try:
+            while running:
+                self.frame_timer.start_frame()
+                running = self.handle_input_events()
+                self.frame_timer.lap("input")
+                if self.loop_mode == "fixed":
+                    self.update_fixed_ticks()
+                else:
+                    self.update_game()
+                self.frame_timer.lap("update")
+                self.render()
+                if not self.startup_trace.finished:
+                    self.startup_trace.finish()
+                frame = self.frame_timer.end_frame()
+                self.record_frame_metrics(frame)
+                self.input_wait_started = time.perf_counter()
+                if self.loop_mode == "fixed":
+                    # Busy waits the last stretch for precise frame pacing
+                    self.clock.tick_busy_loop(self.render_fps)
+                else:
+                    self.clock.tick(self.get_current_speed())
+        finally:
+            # The menu's Exit option leaves through SystemExit
+            profile_path = self.profiler.stop()
+            if profile_path:
+                print(f"Profile written to {profile_path}")
+            self.close_metrics()
+
+
+    def update_fixed_ticks(self):
+        """Run the simulation ticks due since the last frame at the current snake speed."""
+        self.timestep.set_tick_rate(self.get_current_speed())
+        for _ in range(self.timestep.advance()):
             self.update_game()
-            self.render()
-            self.clock.tick(self.get_current_speed())
+
+
+    def record_frame_metrics(self, frame):
+        metrics.FRAMES.inc()
+        metrics.FRAME_SECONDS.observe(frame["frame"])
+        now = time.perf_counter()
+        if self.metrics_sinks and now - self.last_metrics_publish >= METRICS_PUBLISH_INTERVAL:
+            self.last_metrics_publish = now
+            for sink in self.metrics_sinks:
+                sink.publish(metrics.REGISTRY)
+
+
+    def close_metrics(self):
+        for sink in self.metrics_sinks:
+            sink.publish(metrics.REGISTRY)
+            sink.close()
+        self.metrics_sinks = []
 
 
 #endregion
@@ -245,7 +544,9 @@ class MainGame:
 
 
 def main():
-    game = MainGame()
+    startup_trace = StartupTrace(STARTED, sys.stderr if STARTUP_TRACE else None)
+    startup_trace.lap("imports")
+    game = MainGame(startup_trace=startup_trace)
     game.gameloop()
     pygame.quit()
 
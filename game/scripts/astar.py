@@ -0,0 +1,52 @@
+"""
+
+This module contains the A* autopilot strategy.
+
+It plays like the breadth-first Pathfinding strategy, but finds the path to the
+food with an A* search, which expands far fewer cells on large open boards.
+It does not depend on pygame.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Local
+from scripts.pathfinding import Pathfinding
+from scripts.navigation import register_strategy
+
+
+#endregion
+################################################################################
+#region AStarPathfinding
+
+
+@register_strategy("astar")
+class AStarPathfinding(Pathfinding):
+    """
+    Pathfinding that searches for the food with A* instead of a full survey.
+
+    The heuristic is the Manhattan distance, measured around the torus in
+    peaceful mode where paths may wrap over the edges. The survey of the board
+    is only run when the food path is missing or unsafe.
+
+    Methods:
+        _plan_to_food: Find a safe path to the food with A* and cache it.
+    """
+
+    def _plan_to_food(self, head, food_position, limit):
+        """Find a path to the food with A* that leaves room for the body, cache it and return its first move."""
+        if food_position is None or food_position == head:
+            return None
+        found = self.grid_search.astar(head, food_position, self.snake.occupancy_grid(), self.peaceful_mode, self._deadline)
+        self.nodes_expanded += self.grid_search.visited_count
+        self._complete = self._complete and self.grid_search.complete
+        if not found:
+            return None
+        food_move = self.grid_search.first_move(food_position)
+        if food_move and self._flood_fill(self._step(head, food_move), limit) > limit:
+            self._plan = self.grid_search.path_to(food_position)
+            self._plan_food = food_position
+            return food_move
+        return None
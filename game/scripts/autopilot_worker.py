@@ -0,0 +1,127 @@
+"""
+
+This module contains a background worker that plans autopilot moves ahead of the frame.
+
+As soon as a move is committed the game hands the worker a snapshot of the
+snake, and the worker plans the next move while the frame is drawn and the
+game waits for the next tick. When the tick comes the game only picks up the
+finished plan, falling back to a cheap safe move if the worker is not done.
+It does not depend on pygame.
+
+
+Classes:
+    AutopilotWorker: Class for planning the next autopilot move on a background thread.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import threading
+
+
+# Local
+from scripts.navigation import PlanResult, deadline_after, quick_safe_direction
+
+
+#endregion
+################################################################################
+#region AutopilotWorker
+
+
+class AutopilotWorker:
+    """
+    Plan the next autopilot move on a background thread.
+
+    The worker owns its strategy: only the worker thread calls it, and it is
+    pointed at a fresh snapshot of the snake for every request, so the game
+    can keep moving the real snake meanwhile. Only the newest request is
+    planned, and a plan is only handed out for the state it was requested for:
+    the newest request, with the live snake's head and direction unchanged.
+
+    Attributes:
+        strategy (NavigationStrategy): The strategy used on the worker thread.
+        planned_count (int): The number of moves that came from a finished plan.
+        fallback_count (int): The number of moves that fell back to a quick safe move.
+
+    Methods:
+        submit: Start planning the next move from the committed snake state.
+        next_plan: Return the plan for the current state, or a quick safe move if it is not ready.
+        cancel: Drop the pending request and any finished plan.
+        stop: Stop the worker thread.
+    """
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.planned_count = 0
+        self.fallback_count = 0
+        self._condition = threading.Condition()
+        self._sequence = 0
+        self._request = None
+        self._result = None
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"autopilot-{strategy.name}", daemon=True)
+        self._thread.start()
+
+
+    def submit(self, snake, food_position, budget=None):
+        """Start planning the next move from the committed snake state, replacing any older request."""
+        snapshot = snake.copy()
+        state = (snapshot.body[0], snapshot.direction)
+        with self._condition:
+            self._sequence += 1
+            self._request = (self._sequence, snapshot, state, food_position, budget)
+            self._result = None
+            self._condition.notify()
+
+
+    def next_plan(self, snake, food_position):
+        """Return the plan for the state last submitted, or a quick safe move if the worker is not done or the snake has moved on."""
+        with self._condition:
+            result = self._result
+            self._result = None
+        if result is not None and result[0] == self._sequence and result[2] == (snake.body[0], snake.direction):
+            self.planned_count += 1
+            return result[1]
+        self.fallback_count += 1
+        direction = quick_safe_direction(snake, self.strategy.collision_detector, food_position, self.strategy.peaceful_mode)
+        return PlanResult(direction, False)
+
+
+    def cancel(self):
+        """Drop the pending request and any finished plan, e.g. when the game restarts or the autopilot is toggled."""
+        with self._condition:
+            self._sequence += 1
+            self._request = None
+            self._result = None
+
+
+    def stop(self):
+        """Stop the worker thread and wait for it to finish its current plan."""
+        with self._condition:
+            self._running = False
+            self._request = None
+            self._condition.notify()
+        self._thread.join()
+
+
+# --------------------------------------
+# Worker thread
+# --------------------------------------
+    def _run(self):
+        """Plan each request as it arrives until the worker is stopped."""
+        while True:
+            with self._condition:
+                while self._running and self._request is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                sequence, snapshot, state, food_position, budget = self._request
+                self._request = None
+            self.strategy.snake = snapshot
+            result = self.strategy.plan(food_position, deadline_after(budget))
+            with self._condition:
+                if sequence == self._sequence:
+                    self._result = (sequence, result, state)
@@ -0,0 +1,233 @@
+"""
+
+This module contains a vectorized simulation that steps many games at once.
+
+Every game in the batch follows the same rules as Simulation.step, but all
+state lives in NumPy arrays so a whole batch advances with a handful of array
+operations instead of one Python call per snake. Like the simulation module,
+it does not depend on pygame.
+
+
+Classes:
+    BatchSimulation: Class for advancing N independent games in lockstep.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Third Party
+import numpy as np
+
+
+# Local
+from scripts.constants import RIGHT, DIRECTIONS, GRID_WIDTH, GRID_HEIGHT
+from scripts.simulation import StepEvent
+
+
+#endregion
+################################################################################
+#region BatchSimulation
+
+
+# The event of a game that did not step and the death cause of a game still alive
+NO_EVENT = 0
+
+
+class BatchSimulation:
+    """
+    Advance N independent games in lockstep.
+
+    Cells are addressed by their flat index `y * grid_width + x`. Each game keeps
+    its body in a row of `ring` (head at `head_index`) and a row of `occupancy`
+    counts, mirroring SnakeBody. Dead games are frozen until they are reset.
+
+    In peaceful mode the length is capped at the number of grid cells, which
+    is the size of each body ring.
+
+    Attributes:
+        num_games (int): The number of games in the batch.
+        grid_width (int): The width of the grid.
+        grid_height (int): The height of the grid.
+        peaceful_mode (bool): Whether snakes wrap around the edges and ignore themselves.
+        head_x (ndarray): The head column of each game.
+        head_y (ndarray): The head row of each game.
+        direction (ndarray): The index into DIRECTIONS each snake is moving in.
+        length (ndarray): The number of segments of each snake.
+        growing (ndarray): Whether each snake grows on its next move.
+        ring (ndarray): The body ring buffer of each game, as flat cell indices.
+        head_index (ndarray): The ring slot holding each head.
+        occupancy (ndarray): The per-cell segment count of each game.
+        food (ndarray): The flat food cell of each game, -1 when the board is full.
+        alive (ndarray): Whether each game is still running.
+        death_cause (ndarray): The StepEvent value that ended each game (WON when the
+            board was filled), 0 while alive.
+        score (ndarray): The food eaten in each game.
+        ticks (ndarray): The steps taken in each game.
+
+    Methods:
+        reset: Restart all games, or only the ones selected by a mask.
+        step: Advance every live game by one tick and return the events per game.
+        body: Return the body of one game as a list of positions, head first.
+        food_position: Return the food of one game as a position.
+    """
+
+    def __init__(self, num_games, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT, peaceful_mode=False, start=(10, 10), seed=None):
+        self.num_games = num_games
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.num_cells = grid_width * grid_height
+        self.peaceful_mode = peaceful_mode
+        self.start = start
+        self.rng = np.random.default_rng(seed)
+        # Actions index into DIRECTIONS, actions outside that range keep the current direction
+        self._dx = np.array([d[0] for d in DIRECTIONS], dtype=np.int32)
+        self._dy = np.array([d[1] for d in DIRECTIONS], dtype=np.int32)
+        self._rows = np.arange(num_games)
+        self.head_x = np.zeros(num_games, dtype=np.int32)
+        self.head_y = np.zeros(num_games, dtype=np.int32)
+        self.direction = np.zeros(num_games, dtype=np.int8)
+        self.length = np.zeros(num_games, dtype=np.int32)
+        self.growing = np.zeros(num_games, dtype=bool)
+        self.ring = np.zeros((num_games, self.num_cells), dtype=np.int32)
+        self.head_index = np.zeros(num_games, dtype=np.int32)
+        self.occupancy = np.zeros((num_games, self.num_cells), dtype=np.int32)
+        self.food = np.full(num_games, -1, dtype=np.int32)
+        self.alive = np.zeros(num_games, dtype=bool)
+        self.death_cause = np.zeros(num_games, dtype=np.int8)
+        self.score = np.zeros(num_games, dtype=np.int32)
+        self.ticks = np.zeros(num_games, dtype=np.int32)
+        self.reset()
+
+
+    def reset(self, mask=None):
+        """Restart all games, or only the ones selected by a boolean mask."""
+        rows = self._rows if mask is None else np.flatnonzero(mask)
+        if rows.size == 0:
+            return
+        start_x, start_y = self.start
+        start_cell = start_y * self.grid_width + start_x
+        self.head_x[rows] = start_x
+        self.head_y[rows] = start_y
+        self.direction[rows] = DIRECTIONS.index(RIGHT)
+        self.length[rows] = 1
+        self.growing[rows] = False
+        self.head_index[rows] = 0
+        self.ring[rows, 0] = start_cell
+        self.occupancy[rows] = 0
+        self.occupancy[rows, start_cell] = 1
+        self.alive[rows] = True
+        self.death_cause[rows] = NO_EVENT
+        self.score[rows] = 0
+        self.ticks[rows] = 0
+        self._spawn_food(rows)
+
+
+# --------------------------------------
+# Step
+# --------------------------------------
+    def step(self, actions=None):
+        """
+        Advance every live game by one tick.
+
+        Args:
+            actions (array-like): One index into DIRECTIONS per game, or -1 to keep
+                the current direction. None keeps every direction.
+
+        Returns:
+            ndarray: The StepEvent value for each game (MOVED, ATE, DIED_WALL,
+                DIED_SELF or WON), or 0 for games that were already over.
+        """
+        events = np.zeros(self.num_games, dtype=np.int8)
+        if actions is not None:
+            actions = np.asarray(actions)
+            turn = self.alive & (actions >= 0) & (actions < len(DIRECTIONS))
+            self.direction[turn] = actions[turn]
+        rows = np.flatnonzero(self.alive)
+        if rows.size == 0:
+            return events
+        new_x = self.head_x[rows] + self._dx[self.direction[rows]]
+        new_y = self.head_y[rows] + self._dy[self.direction[rows]]
+        if self.peaceful_mode:
+            new_x %= self.grid_width
+            new_y %= self.grid_height
+        else:
+            hit_wall = (new_x < 0) | (new_x >= self.grid_width) | (new_y < 0) | (new_y >= self.grid_height)
+            if hit_wall.any():
+                self._die(rows[hit_wall], StepEvent.DIED_WALL, events)
+                self.ticks[rows[hit_wall]] += 1
+                keep = ~hit_wall
+                rows, new_x, new_y = rows[keep], new_x[keep], new_y[keep]
+        self.ticks[rows] += 1
+        head_cells = self._move(rows, new_x, new_y)
+        events[rows] = StepEvent.MOVED.value
+        if not self.peaceful_mode:
+            hit_self = self.occupancy[rows, head_cells] > 1
+            if hit_self.any():
+                self._die(rows[hit_self], StepEvent.DIED_SELF, events)
+                keep = ~hit_self
+                rows, head_cells = rows[keep], head_cells[keep]
+        ate = head_cells == self.food[rows]
+        if ate.any():
+            eaten = rows[ate]
+            self.growing[eaten] = self.length[eaten] < self.num_cells
+            self.score[eaten] += 1
+            events[eaten] = StepEvent.ATE.value
+            self._spawn_food(eaten)
+            full = eaten[self.food[eaten] < 0]
+            if full.size:
+                self._die(full, StepEvent.WON, events)
+        return events
+
+
+    def _move(self, rows, new_x, new_y):
+        """Release the tails of the snakes that are not growing and push the new heads."""
+        head_cells = new_y * self.grid_width + new_x
+        # Release the tail first, a full ring reuses its slot for the new head
+        shrink = rows[~self.growing[rows]]
+        tail_slots = (self.head_index[shrink] + self.length[shrink] - 1) % self.num_cells
+        self.occupancy[shrink, self.ring[shrink, tail_slots]] -= 1
+        self.length[shrink] -= 1
+        self.head_x[rows] = new_x
+        self.head_y[rows] = new_y
+        self.head_index[rows] = (self.head_index[rows] - 1) % self.num_cells
+        self.ring[rows, self.head_index[rows]] = head_cells
+        self.occupancy[rows, head_cells] += 1
+        self.length[rows] += 1
+        self.growing[rows] = False
+        return head_cells
+
+
+    def _die(self, rows, cause, events):
+        """Mark games as over and record the cause."""
+        self.alive[rows] = False
+        self.death_cause[rows] = cause.value
+        events[rows] = cause.value
+
+
+    def _spawn_food(self, rows):
+        """Place food on a uniformly random free cell of each game, or -1 when the board is full."""
+        free = self.occupancy[rows] == 0
+        keys = self.rng.random(free.shape)
+        keys[~free] = -1.0
+        cells = keys.argmax(axis=1).astype(np.int32)
+        cells[~free.any(axis=1)] = -1
+        self.food[rows] = cells
+
+
+# --------------------------------------
+# Inspection
+# --------------------------------------
+    def body(self, game):
+        """Return the body of one game as a list of positions, head first."""
+        slots = (self.head_index[game] + np.arange(self.length[game])) % self.num_cells
+        return [(int(cell % self.grid_width), int(cell // self.grid_width)) for cell in self.ring[game, slots]]
+
+
+    def food_position(self, game):
+        """Return the food of one game as a position, or None when the board is full."""
+        cell = int(self.food[game])
+        if cell < 0:
+            return None
+        return cell % self.grid_width, cell // self.grid_width
@@ -0,0 +1,94 @@
+"""
+
+This module contains a bitboard kernel for whole-grid set operations.
+
+A set of cells is stored as one Python int where bit `y * width + x` is set
+for every cell in the set. Moving a whole set one step is a shift and a mask,
+so a flood fill takes one pass per step of distance instead of one Python
+iteration per cell. It does not depend on pygame.
+
+
+Classes:
+    Bitboard: Class for the grid geometry and the bitboard operations on it.
+
+"""
+
+################################################################################
+#region Bitboard
+
+
+class Bitboard:
+    """
+    Grid geometry and operations for big-int bitboards.
+
+    Attributes:
+        width (int): The width of the grid.
+        height (int): The height of the grid.
+        full (int): Mask with every cell of the grid set.
+
+    Methods:
+        bit: Return the mask of a single position.
+        from_positions: Return the mask of several positions.
+        neighbors: Return the cells adjacent to any cell in a mask.
+        flood_fill: Return every open cell connected to a seed mask.
+        count: Return the number of cells in a mask.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.full = (1 << (width * height)) - 1
+        left_column = 0
+        for y in range(height):
+            left_column |= 1 << (y * width)
+        right_column = left_column << (width - 1)
+        # A shift by one column wraps into the next row, these masks drop the wrapped bits
+        self._not_left = self.full & ~left_column
+        self._not_right = self.full & ~right_column
+
+
+    def bit(self, position):
+        """Return the mask of a single position, 0 if it is outside the grid."""
+        x, y = position
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return 1 << (y * self.width + x)
+        return 0
+
+
+    def from_positions(self, positions):
+        """Return the mask of several positions, ignoring the ones outside the grid."""
+        mask = 0
+        for position in positions:
+            mask |= self.bit(position)
+        return mask
+
+
+    def neighbors(self, mask):
+        """Return the cells orthogonally adjacent to any cell in a mask."""
+        width = self.width
+        return (((mask << 1) & self._not_left) |
+                ((mask >> 1) & self._not_right) |
+                ((mask << width) & self.full) |
+                (mask >> width))
+
+
+    def flood_fill(self, seed, open_mask, limit=None):
+        """
+        Return every cell of open_mask connected to the seed mask, plus the seed itself.
+
+        If limit is given, stop as soon as more than limit cells have been reached.
+        """
+        reach = seed
+        frontier = seed
+        while frontier:
+            frontier = self.neighbors(frontier) & open_mask & ~reach
+            reach |= frontier
+            if limit is not None and reach.bit_count() > limit:
+                break
+        return reach
+
+
+    @staticmethod
+    def count(mask):
+        """Return the number of cells in a mask."""
+        return mask.bit_count()
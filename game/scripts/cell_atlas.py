@@ -0,0 +1,193 @@
+"""
+
+This module contains the tile atlas used to draw the snake and food.
+
+Every grid cell is a solid square, so each color only has to be filled once.
+The snake gradient is looked up per theme and length instead of blended per
+segment, and the whole board is drawn with one Surface.blits() call.
+
+
+Classes:
+    CellAtlas: Class for caching filled cell tiles and snake gradients.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+from collections import OrderedDict
+
+
+# Third Party
+import pygame
+
+
+# Local
+from scripts.constants import CELL_SIZE, BORDER_THICKNESS
+
+
+#endregion
+################################################################################
+#region CellAtlas
+
+
+class _CellOrigins(dict):
+    """Screen position of the top left corner of each grid cell, computed on first use."""
+
+    def __missing__(self, position):
+        x, y = position
+        origin = self[position] = (x * CELL_SIZE + BORDER_THICKNESS, y * CELL_SIZE + BORDER_THICKNESS)
+        return origin
+
+
+class CellAtlas:
+    """
+    Cache filled cell tiles and snake gradients, and draw the board in one batch.
+
+    Tiles are keyed by color, so themes that share a color share its tile. The
+    gradient of a snake depends on its length, which only changes when it
+    grows, so the last few (theme, length) gradients are kept.
+
+    Attributes:
+        max_gradients (int): The number of (theme, length) gradients kept.
+        builds (int): The number of tiles filled so far, for checking the cache works.
+
+    Methods:
+        tile: Return the filled tile for a color.
+        gradient_colors: Return the color of each snake segment, head first.
+        gradient_tiles: Return the tile of each snake segment, head first.
+        board_blits: Return the blits() sequence that draws a snake and food.
+        draw: Draw a snake and food onto a surface with one blits() call.
+        draw_motion: Slide the head into its next cell and the tail out of its cell, between two ticks.
+        clear: Drop every cached tile and gradient.
+    """
+
+    def __init__(self, max_gradients=8):
+        self.max_gradients = max_gradients
+        self.builds = 0
+        self._tiles = {}
+        self._gradients = OrderedDict()
+        self._origins = _CellOrigins()
+
+
+    def tile(self, color):
+        """Return the filled tile for a color, filling it on first use."""
+        tile = self._tiles.get(color)
+        if tile is None:
+            tile = pygame.Surface((CELL_SIZE, CELL_SIZE))
+            if pygame.display.get_surface() is not None:
+                tile = tile.convert()
+            tile.fill(color)
+            self._tiles[color] = tile
+            self.builds += 1
+        return tile
+
+
+# --------------------------------------
+# Gradients
+# --------------------------------------
+    def gradient_colors(self, theme, length):
+        """Return the color of each snake segment, head first, blending from the body color at the neck to the tail color."""
+        return self._gradient(theme, length)[0]
+
+
+    def gradient_tiles(self, theme, length):
+        """Return the tile of each snake segment, head first."""
+        return self._gradient(theme, length)[1]
+
+
+    def _gradient(self, theme, length):
+        key = (theme, length)
+        gradient = self._gradients.get(key)
+        if gradient is not None:
+            self._gradients.move_to_end(key)
+            return gradient
+        colors = [theme.head_color]
+        for index in range(1, length):
+            colors.append(_blend_colors(theme.body_color, theme.tail_color, (index - 1) / (length - 1)))
+        gradient = self._gradients[key] = (colors, [self.tile(color) for color in colors])
+        if len(self._gradients) > self.max_gradients:
+            self._gradients.popitem(last=False)
+        return gradient
+
+
+# --------------------------------------
+# Draw
+# --------------------------------------
+    def board_blits(self, snake=None, food=None):
+        """
+        Return the blits() sequence that draws a snake and food.
+
+        The snake is drawn from the tail to the head so later segments, and the
+        head, end up on top where they overlap. The food goes last.
+        """
+        origins = self._origins
+        blits = []
+        if snake is not None:
+            tiles = self.gradient_tiles(snake.theme, len(snake.body))
+            blits = [(tile, origins[segment]) for tile, segment in zip(reversed(tiles), reversed(snake.body))]
+        if food is not None and food.position is not None:
+            blits.append((self.tile(food.theme.food_color), origins[food.position]))
+        return blits
+
+
+    def draw(self, surface, snake=None, food=None):
+        """Draw a snake and food onto a surface with one blits() call."""
+        surface.blits(self.board_blits(snake, food), False)
+
+
+    def draw_motion(self, surface, snake, alpha, background_color):
+        """
+        Slide the head into its next cell and the tail out of its cell, between two ticks.
+
+        Draw this over the board drawn by draw. The head moves alpha of a cell
+        in its current direction, clipped to the play area, and the same share
+        of the tail cell is cleared unless the snake is about to grow.
+
+        Args:
+            alpha (float): How far the game is into the next tick, from 0 to 1.
+            background_color (tuple): The color of the empty play area.
+        """
+        offset = int(alpha * CELL_SIZE)
+        if offset <= 0 or len(snake.body) < 2:
+            return
+        previous_clip = surface.get_clip()
+        surface.set_clip(pygame.Rect(BORDER_THICKNESS, BORDER_THICKNESS, snake.grid_width * CELL_SIZE, snake.grid_height * CELL_SIZE))
+        x, y = self._origins[snake.body[0]]
+        dx, dy = snake.direction
+        surface.blit(self.tile(snake.theme.head_color), (x + dx * offset, y + dy * offset))
+        tail = snake.body[-1]
+        dx, dy = tail[0] - snake.body[-2][0], tail[1] - snake.body[-2][1]
+        # Skip tails that wrapped around the board or share their cell with another segment
+        if not snake.growing and abs(dx) + abs(dy) == 1 and snake.occupancy(tail) == 1:
+            x, y = self._origins[tail]
+            if dx:
+                strip = pygame.Rect(x + CELL_SIZE - offset if dx > 0 else x, y, offset, CELL_SIZE)
+            else:
+                strip = pygame.Rect(x, y + CELL_SIZE - offset if dy > 0 else y, CELL_SIZE, offset)
+            surface.fill(background_color, strip)
+        surface.set_clip(previous_clip)
+
+
+    def clear(self):
+        """Drop every cached tile and gradient."""
+        self._tiles.clear()
+        self._gradients.clear()
+
+
+def _blend_colors(color1, color2, factor):
+    """Blend two colors together by a factor (0 to 1)."""
+    r1, g1, b1 = color1
+    r2, g2, b2 = color2
+    r = int(r1 + (r2 - r1) * factor)
+    g = int(g1 + (g2 - g1) * factor)
+    b = int(b1 + (b2 - b1) * factor)
+    return r, g, b
+
+
+CELL_ATLAS = CellAtlas()
+
+
+#endregion
@@ -38,8 +38,7 @@ class CollisionDetection:
         """Check if snake collides with itself."""
         if peaceful_mode:
             return False
-        head = snake.body[0]
-        return head in snake.body[1:]
+        return snake.is_self_colliding()
 
 
     def check_food_collision(self, head, food_pos):
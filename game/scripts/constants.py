@@ -1,6 +1,22 @@
 """This module contains the constants used in the game."""
 
 
+# Standard Library
+import os
+
+
+def _env_int(name, default):
+    """Return an integer environment variable, or the default if it is unset or not an integer."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"Ignoring {name}={value!r}, expected an integer")
+        return default
+
+
 # Constants
 GRID_WIDTH = 36
 GRID_HEIGHT = 24
@@ -9,6 +25,26 @@ BORDER_THICKNESS = 20
 SCREEN_WIDTH = GRID_WIDTH * CELL_SIZE + (2 * BORDER_THICKNESS)
 SCREEN_HEIGHT = GRID_HEIGHT * CELL_SIZE + (2 * BORDER_THICKNESS)
 BASE_FPS = 10
+# Frames kept for the performance overlay graph and CSV dump
+PERF_HISTORY_FRAMES = 300
+# "full" redraws and flips the whole screen every frame, "dirty" pushes only the changed cells and HUD,
+# "grid" draws the board into a grid sized framebuffer scaled up to the play area
+RENDER_MODE = os.environ.get("SNAKE_RENDER_MODE", "full")
+# "lockstep" runs one tick per frame at the snake speed, "fixed" runs ticks at the snake speed from an
+# accumulator and draws frames at RENDER_FPS (0 for uncapped), sliding the head and tail if INTERPOLATE is set
+LOOP_MODE = os.environ.get("SNAKE_LOOP_MODE", "lockstep")
+RENDER_FPS = _env_int("SNAKE_RENDER_FPS", 60)
+INTERPOLATE = os.environ.get("SNAKE_INTERPOLATE", "1") == "1"
+
+
+# Metrics export (see scripts.metrics), off unless configured
+METRICS_FILE = os.environ.get("SNAKE_METRICS_FILE")
+METRICS_PORT = _env_int("SNAKE_METRICS_PORT", 0)
+METRICS_PUBLISH_INTERVAL = 10.0
+# Print how long each startup phase took once the first frame is on screen
+STARTUP_TRACE = os.environ.get("SNAKE_STARTUP_TRACE", "0") == "1"
+# Profile the game loop from startup and write it here on exit, F5 toggles profiling at any time
+PROFILE_PATH = os.environ.get("SNAKE_PROFILE")
 
 
 # Colors
@@ -27,3 +63,13 @@ UP = (0, -1)
 DOWN = (0, 1)
 LEFT = (-1, 0)
 RIGHT = (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+
+# Autopilot strategies, by registered name (see scripts.navigation)
+AUTOPILOT_STRATEGY = os.environ.get("SNAKE_AUTOPILOT_STRATEGY", "bfs")
+DEMO_STRATEGY = os.environ.get("SNAKE_DEMO_STRATEGY", AUTOPILOT_STRATEGY)
+# Share of each frame the autopilot may spend deciding a move
+AUTOPILOT_FRAME_BUDGET = 0.5
+# Plan the next autopilot move on a background thread while the frame is drawn
+AUTOPILOT_BACKGROUND = os.environ.get("SNAKE_AUTOPILOT_BACKGROUND", "0") == "1"
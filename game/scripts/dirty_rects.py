@@ -0,0 +1,72 @@
+"""
+
+This module contains the change tracking for dirty rectangle rendering.
+
+Between two ticks only a few grid cells change what covers them (the new
+head, the neck and the cell the tail left), so the renderer can redraw and
+push just those cells instead of the whole screen. It does not depend on
+pygame.
+
+
+Classes:
+    CellDiff: Class for finding the grid cells to repaint since the last frame.
+
+"""
+
+################################################################################
+#region CellDiff
+
+
+class CellDiff:
+    """
+    Find the grid cells to repaint since the last frame.
+
+    Cells are compared by what covers them (such as "head", "body" or "food"),
+    not by color. The snake gradient slides one segment along the body every
+    tick, so comparing colors would repaint the whole snake each tick. The
+    painted body colors are left to drift instead, and the whole body is
+    repainted once they have drifted by one of bands steps of its length.
+
+    Attributes:
+        bands (int): How many steps of the body length the gradient may drift before the body is repainted.
+        kinds (dict): The {position: kind} of every drawn cell in the last frame.
+        drift (int): The frames with changes since the body was last painted in full.
+
+    Methods:
+        changes: Return the cells to repaint and remember what covers each cell now.
+        reset: Remember a frame as drawn in full.
+    """
+
+    def __init__(self, bands=8):
+        self.bands = bands
+        self.kinds = {}
+        self.drift = 0
+
+
+    def changes(self, kinds, colors):
+        """
+        Return the cells to repaint and remember what covers each cell now.
+
+        Args:
+            kinds (dict): The {position: kind} of every drawn cell.
+            colors (dict): The {position: color} of every drawn cell.
+
+        Returns:
+            list: (position, color) pairs, with color None for cells that are empty now.
+        """
+        previous = self.kinds
+        changed = {position for position, kind in kinds.items() if previous.get(position) != kind}
+        changed.update(position for position in previous if position not in kinds)
+        if changed:
+            self.drift += 1
+            if self.drift * self.bands >= len(kinds):
+                self.drift = 0
+                changed.update(kinds)
+        self.kinds = kinds
+        return [(position, colors.get(position)) for position in changed]
+
+
+    def reset(self, kinds=None):
+        """Remember a frame as drawn in full, so the next changes are relative to it."""
+        self.kinds = kinds if kinds is not None else {}
+        self.drift = 0
@@ -2,6 +2,10 @@
 #region Imports
 
 
+# Standard Library
+from collections import OrderedDict
+
+
 # Third Party
 import pygame
 
@@ -10,6 +14,81 @@ import pygame
 from scripts.constants import WHITE, BLACK
 
 
+#endregion
+################################################################################
+#region TextCache
+
+
+class TextCache:
+    """
+    Least recently used cache of outlined text surfaces.
+
+    A surface is composited once per (text, size, color), so drawing the same
+    text again is a single blit instead of nine font renders.
+
+    Attributes:
+        max_bytes (int): The memory bound for the cached surfaces.
+        size_bytes (int): The memory the cached surfaces take now.
+        hits (int): The lookups served from the cache.
+        misses (int): The lookups that had to render.
+        evictions (int): The surfaces dropped to stay under the memory bound.
+
+    Methods:
+        get: Return the outlined surface for a text, rendering it on a miss.
+        clear: Drop every cached surface.
+        stats: Return the cache statistics.
+    """
+
+    def __init__(self, max_bytes=4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._surfaces = OrderedDict()
+
+
+    def get(self, text, size, color):
+        """Return the outlined surface for a text, rendering it on a miss."""
+        key = (text, size, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = _render_outlined(text, _create_font(size), color)
+        self._surfaces[key] = surface
+        self.size_bytes += _surface_bytes(surface)
+        while self.size_bytes > self.max_bytes and len(self._surfaces) > 1:
+            _, evicted = self._surfaces.popitem(last=False)
+            self.size_bytes -= _surface_bytes(evicted)
+            self.evictions += 1
+        return surface
+
+
+    def clear(self):
+        """Drop every cached surface."""
+        self._surfaces.clear()
+        self.size_bytes = 0
+
+
+    def stats(self):
+        """Return the cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._surfaces),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+TEXT_CACHE = TextCache()
+
+
 #endregion
 ################################################################################
 #region draw_text
@@ -17,31 +96,35 @@ from scripts.constants import WHITE, BLACK
 
 # Offsets for the text outline
 OFFSETS = [(1, 1), (-1, -1), (-1, 1), (1, -1), (0, 1), (0, -1), (1, 0), (-1, 0)]
+_FONTS = {}
 
 
 def draw_text(surface, text, size, x, y, color=WHITE):
     """Draw text with an outline on a surface."""
-    font = _create_font(size)
-    _draw_text_outline(surface, text, x, y, font)
-    _draw_main_text(surface, text, x, y, color, font)
+    text_surface = TEXT_CACHE.get(text, size, color)
+    surface.blit(text_surface, text_surface.get_rect(center=(x, y)))
 
 
 def _create_font(size):
-    """Create a font object."""
-    font = pygame.font.Font(None, size)
+    """Return the font for a size, creating it on first use."""
+    font = _FONTS.get(size)
+    if font is None:
+        font = _FONTS[size] = pygame.font.Font(None, size)
     return font
 
 
-def _draw_text_outline(surface, text, x, y, font):
-    """Draw the outline text on the surface."""
+def _render_outlined(text, font, color):
+    """Render the outline and the main text onto one surface with a one pixel margin."""
+    outline_surface = font.render(text, True, BLACK)
+    text_surface = font.render(text, True, color)
+    width, height = text_surface.get_size()
+    surface = pygame.Surface((width + 2, height + 2), pygame.SRCALPHA)
     for offset_x, offset_y in OFFSETS:
-        outline_surface = font.render(text, True, BLACK)
-        outline_rect = outline_surface.get_rect(center=(x + offset_x, y + offset_y))
-        surface.blit(outline_surface, outline_rect)
+        surface.blit(outline_surface, (1 + offset_x, 1 + offset_y))
+    surface.blit(text_surface, (1, 1))
+    return surface
 
 
-def _draw_main_text(surface, text, x, y, color, font):
-    """Draw the main text on the surface."""
-    text_surface = font.render(text, True, color)
-    text_rect = text_surface.get_rect(center=(x, y))
-    surface.blit(text_surface, text_rect)
+def _surface_bytes(surface):
+    """Return the memory a surface's pixels take."""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
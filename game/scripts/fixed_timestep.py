@@ -0,0 +1,124 @@
+"""
+
+This module contains the accumulator that runs the simulation at a fixed tick
+rate while frames are drawn at their own rate.
+
+Each frame adds the real time that passed to an accumulator and runs one tick
+for every whole tick period in it. What is left over is how far the game is
+into the next tick, which the renderer can use to interpolate. It does not
+depend on pygame.
+
+
+Classes:
+    FixedTimestep: Class for scheduling fixed simulation ticks and measuring their jitter.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import time
+from collections import deque
+from statistics import fmean, pstdev
+
+
+#endregion
+################################################################################
+#region FixedTimestep
+
+
+class FixedTimestep:
+    """
+    Schedule fixed simulation ticks from a per-frame accumulator.
+
+    Attributes:
+        tick_rate (float): The simulation ticks per second.
+        max_ticks_per_frame (int): The most ticks run in one frame, the rest are dropped so a stall cannot snowball.
+        dropped_ticks (int): The ticks dropped by that limit.
+        tick_intervals (deque): Seconds between the last ticks.
+        frame_intervals (deque): Seconds between the last frames.
+
+    Methods:
+        set_tick_rate: Change the tick rate, keeping the time already accumulated.
+        advance: Add the time since the last frame and return how many ticks to run.
+        alpha: Return how far the game is into the next tick, from 0 to 1.
+        reset: Forget the accumulated time and the recorded intervals.
+        stats: Return the mean and jitter of the tick and frame intervals.
+    """
+
+    def __init__(self, tick_rate, max_ticks_per_frame=5, history_size=300, clock=time.perf_counter):
+        self.clock = clock
+        self.tick_rate = tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.dropped_ticks = 0
+        self.tick_intervals = deque(maxlen=history_size)
+        self.frame_intervals = deque(maxlen=history_size)
+        self._accumulator = 0.0
+        self._last_frame = None
+        self._last_tick = None
+
+
+    def set_tick_rate(self, tick_rate):
+        """Change the tick rate, keeping the time already accumulated."""
+        self.tick_rate = tick_rate
+
+
+    def advance(self):
+        """Add the time since the last frame to the accumulator and return how many ticks to run now."""
+        now = self.clock()
+        if self._last_frame is None:
+            self._last_frame = now
+            return 0
+        elapsed = now - self._last_frame
+        self._last_frame = now
+        self.frame_intervals.append(elapsed)
+        period = 1.0 / self.tick_rate
+        self._accumulator += elapsed
+        ticks = int(self._accumulator / period)
+        self._accumulator -= ticks * period
+        if ticks > self.max_ticks_per_frame:
+            self.dropped_ticks += ticks - self.max_ticks_per_frame
+            ticks = self.max_ticks_per_frame
+        if ticks:
+            if self._last_tick is not None:
+                self.tick_intervals.append(now - self._last_tick)
+            self._last_tick = now
+        return ticks
+
+
+    def alpha(self):
+        """Return how far the game is into the next tick, from 0 to 1."""
+        return min(1.0, self._accumulator * self.tick_rate)
+
+
+    def reset(self):
+        """Forget the accumulated time and the recorded intervals."""
+        self._accumulator = 0.0
+        self._last_frame = None
+        self._last_tick = None
+        self.dropped_ticks = 0
+        self.tick_intervals.clear()
+        self.frame_intervals.clear()
+
+
+    def stats(self):
+        """
+        Return the mean and jitter of the tick and frame intervals in seconds.
+
+        Jitter is the standard deviation of the intervals. A tick interval
+        is measured between frames that ran at least one tick.
+        """
+        ticks = list(self.tick_intervals)
+        frames = list(self.frame_intervals)
+        return {
+            "tick_interval": fmean(ticks) if ticks else 0.0,
+            "tick_jitter": pstdev(ticks) if len(ticks) > 1 else 0.0,
+            "frame_interval": fmean(frames) if frames else 0.0,
+            "frame_jitter": pstdev(frames) if len(frames) > 1 else 0.0,
+            "dropped_ticks": self.dropped_ticks,
+        }
+
+
+#endregion
@@ -3,16 +3,11 @@
 #region Imports
 
 
-# Standard Library
-import random
-
-
-# Third Party
-import pygame
-
-
 # Local
-from scripts.constants import GRID_WIDTH, GRID_HEIGHT, CELL_SIZE, BORDER_THICKNESS
+from scripts.constants import CELL_SIZE, BORDER_THICKNESS
+from scripts.cell_atlas import CELL_ATLAS
+from scripts.simulation import FoodSpawner
+from scripts import metrics
 
 
 #endregion
@@ -20,11 +15,12 @@ from scripts.constants import GRID_WIDTH, GRID_HEIGHT, CELL_SIZE, BORDER_THICKNE
 #region Food
 
 
-class Food:
+class Food(FoodSpawner):
     """
     Handle the food object for the game.
 
-    The snake grows when it eats the food.
+    The snake grows when it eats the food. The placement rules live in
+    FoodSpawner, this class adds the theme and drawing.
 
     Attributes:
         theme (Theme): The theme for the game.
@@ -33,26 +29,31 @@ class Food:
     Methods:
         random_position: Generate a random position for the food.
         draw: Draw the food on the screen.
+        cell_colors: Record the color draw gives the food cell.
 
     """
 
-    def __init__(self, theme, snake):
+    def __init__(self, theme, snake, rng=None):
         self.theme = theme
-        self.position = self.random_position(snake)
+        super().__init__(snake, rng)
 
 
     def random_position(self, snake):
-        """Generate a random position for the food, not on the snake."""
-        while True:
-            pos = (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
-            if pos not in snake.body:
-                return pos
+        """Generate a random position for the food, counting the attempt in the game metrics."""
+        metrics.FOOD_RESPAWN_ATTEMPTS.inc()
+        return super().random_position(snake)
 
 
     def draw(self, surface):
         """Draw the food on the screen."""
+        if self.position is None:
+            return
         x, y = self.position
-        pygame.draw.rect(surface, self.theme.food_color,
-            pygame.Rect(x * CELL_SIZE + BORDER_THICKNESS,
-                y * CELL_SIZE + BORDER_THICKNESS,
-                CELL_SIZE, CELL_SIZE))
+        surface.blit(CELL_ATLAS.tile(self.theme.food_color), (x * CELL_SIZE + BORDER_THICKNESS, y * CELL_SIZE + BORDER_THICKNESS))
+
+
+    def cell_colors(self, colors):
+        """Record the color draw gives the food cell in a {position: color} dict."""
+        if self.position is not None:
+            colors[self.position] = self.theme.food_color
+        return colors
@@ -0,0 +1,98 @@
+"""
+
+This module contains a timer for the phases of each frame.
+
+The game loop and the renderer call lap() after each phase, which costs one
+clock read, so the timer can stay on in normal play. It does not depend on
+pygame.
+
+
+Classes:
+    FrameTimer: Class for timing the named phases of each frame.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import time
+from collections import deque
+
+
+#endregion
+################################################################################
+#region FrameTimer
+
+
+class FrameTimer:
+    """
+    Time the named phases of each frame and keep the last frames.
+
+    Attributes:
+        phases (dict): Seconds spent in each phase of the current frame.
+        history (deque): The phase times of the last finished frames, each with a "frame" total.
+        frame_count (int): The number of frames finished.
+
+    Methods:
+        start_frame: Start timing a new frame.
+        mark: Restart the lap clock without recording a phase.
+        lap: Add the time since the last lap or mark to a phase.
+        end_frame: Finish the frame, keep it in the history and return its phase times.
+        averages: Return the mean seconds per phase over the history.
+        reset: Forget the frames timed so far.
+    """
+
+    def __init__(self, history_size=300, clock=time.perf_counter):
+        self.clock = clock
+        self.phases = {}
+        self.history = deque(maxlen=history_size)
+        self.frame_count = 0
+        self._frame_start = clock()
+        self._last = self._frame_start
+
+
+    def start_frame(self):
+        """Start timing a new frame."""
+        self.phases = {}
+        self._frame_start = self._last = self.clock()
+
+
+    def mark(self):
+        """Restart the lap clock without recording a phase, so untimed work is not counted."""
+        self._last = self.clock()
+
+
+    def lap(self, phase):
+        """Add the time since the last lap or mark to a phase of the current frame."""
+        now = self.clock()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+
+    def end_frame(self):
+        """Finish the frame, keep it in the history and return its phase times."""
+        frame = dict(self.phases)
+        frame["frame"] = self.clock() - self._frame_start
+        self.history.append(frame)
+        self.frame_count += 1
+        return frame
+
+
+    def averages(self):
+        """Return the mean seconds per phase over the history, counting a missing phase as zero."""
+        if not self.history:
+            return {}
+        totals = {}
+        for frame in self.history:
+            for phase, seconds in frame.items():
+                totals[phase] = totals.get(phase, 0.0) + seconds
+        return {phase: seconds / len(self.history) for phase, seconds in totals.items()}
+
+
+    def reset(self):
+        """Forget the frames timed so far."""
+        self.history.clear()
+        self.frame_count = 0
+        self.start_frame()
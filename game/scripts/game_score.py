@@ -59,10 +59,14 @@ class HighScores:
     """
     High scores class.
 
+    The scores file is read the first time the scores are drawn or added to,
+    so creating the class costs nothing at startup.
+
     Attributes:
         score_range (int): The number of high scores to display.
         scores (list): The list of high scores.
         scores_file (Path): The file to store the high scores.
+        loaded (bool): Whether the scores were read from the file.
 
     Methods:
         load_scores: Load the high scores from the file.
@@ -76,14 +80,17 @@ class HighScores:
         self.score_range = 5
         self.scores = []
         self.scores_file = Path("high_scores.txt")
-        self._load_scores()
+        self.loaded = False
 
 
 # --------------------------------------
 # Load
 # --------------------------------------
     def _load_scores(self):
-        """Load the high scores from the text file."""
+        """Load the high scores from the text file the first time they are needed."""
+        if self.loaded:
+            return
+        self.loaded = True
         self._fetch_saved_scores()
         self._truncate_and_fill_scores()
 
@@ -117,6 +124,7 @@ class HighScores:
 
     def add_score(self, score):
         """Add a new score to the list of high scores."""
+        self._load_scores()
         self.scores.append(score)
         self.scores = sorted(self.scores, reverse=True)[:self.score_range]
         self._save_scores()
@@ -128,6 +136,7 @@ class HighScores:
 # --------------------------------------
     def draw(self, surface, x, y, spacing=30):
         """Draw the high scores on the screen."""
+        self._load_scores()
         draw_text(surface, "HIGH SCORES", 48, x, y)
         for i, score in enumerate(self.scores, 1):
             draw_text(surface, f"{i}. {score}", 24, x, y + spacing * (i + 1))
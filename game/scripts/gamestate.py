@@ -17,6 +17,7 @@ Classes:
 
 
 # Standard Library
+import time
 from enum import Enum
 
 
@@ -28,6 +29,12 @@ import pygame
 from scripts.constants import WHITE, YELLOW, UP, DOWN, LEFT, RIGHT
 from scripts.theme import Theme
 from scripts.draw_text import draw_text
+from scripts.cell_atlas import CELL_ATLAS
+from scripts.simulation import Simulation, StepEvent
+from scripts.navigation import create_strategy, deadline_after
+from scripts.autopilot_worker import AutopilotWorker
+from scripts.input_queue import TurnQueue
+from scripts import metrics
 
 
 #endregion
@@ -78,12 +85,14 @@ class MainMenu:
     Methods:
         handle_input: Handle input events for the main menu.
         draw: Draw the main menu on the screen.
+        draw_static: Draw the parts of the menu that never change.
+        draw_dynamic: Draw the parts of the menu that follow the selection.
     """
 
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, themes=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.themes = Theme.get_themes()
+        self.themes = themes if themes is not None else Theme.get_themes()
         self.selected_theme_index = 0
         self.difficulties = list(Difficulty)
         self.selected_difficulty = Difficulty.MEDIUM
@@ -151,11 +160,21 @@ class MainMenu:
 # --------------------------------------
     def draw(self, surface):
         """Draw the main menu on the screen."""
+        self.draw_static(surface)
+        self.draw_dynamic(surface)
+
+
+    def draw_static(self, surface):
+        """Draw the parts of the menu that never change, which can be cached in a layer."""
         self._draw_title(surface)
-        self._draw_menu_options(surface)
         self._draw_instructions(surface)
 
 
+    def draw_dynamic(self, surface):
+        """Draw the parts of the menu that follow the selection."""
+        self._draw_menu_options(surface)
+
+
     def _draw_title(self, surface):
         """Draw the title on the screen."""
         draw_text(surface, "SNAKE", 64, self.screen_width // 2, 60)
@@ -187,6 +206,10 @@ class MainMenu:
 #region PlayingGame
 
 
+# Keys that steer the snake
+DIRECTION_KEYS = {pygame.K_UP: UP, pygame.K_DOWN: DOWN, pygame.K_LEFT: LEFT, pygame.K_RIGHT: RIGHT}
+
+
 class PlayingGame:
     """
     Handles the active gameplay state.
@@ -196,13 +219,21 @@ class PlayingGame:
         food (Food): The food object.
         collision_detector (CollisionDetection): The collision detection handler.
         score (GameScore): The score tracker.
-        navigation_handler (Pathfinding): The autopilot navigation system.
+        navigation_handler (NavigationStrategy): The autopilot navigation system.
         autopilot_enabled (bool): Whether autopilot mode is active.
+        simulation (Simulation): The simulation that applies the game rules.
+        decision_budget (float): Seconds the autopilot may spend per move, None for no limit.
+        last_plan (PlanResult): The last autopilot decision and whether its search finished.
+        decision_time (float): Seconds the last autopilot decision took on the frame, None if there was none.
+        autopilot_worker (AutopilotWorker): Plans moves on a background thread, None to plan on the frame.
+        turn_queue (TurnQueue): The turns pressed since the last tick, applied one per tick.
 
     Methods:
+        set_background_planning: Plan autopilot moves on a background thread or on the frame.
         handle_input: Handle input events during gameplay.
         update: Update game logic.
         draw: Draw the game elements.
+        close: Stop the background planning worker.
     """
 
     def __init__(self, snake, food, collision_detector, score):
@@ -213,23 +244,58 @@ class PlayingGame:
         self.navigation_handler = None
         self.autopilot_enabled = False
         self.game_mode = GameMode.CLASSIC
+        self.simulation = Simulation(snake, food, collision_detector)
+        self.decision_budget = None
+        self.last_plan = None
+        self.decision_time = None
+        self.autopilot_worker = None
+        self.turn_queue = TurnQueue()
 
 
     def set_navigation_handler(self, handler):
         """Set the pathfinding handler for autopilot mode."""
         self.navigation_handler = handler
+        if handler:
+            handler.peaceful_mode = self.game_mode == GameMode.PEACEFUL
 
 
     def set_game_mode(self, mode):
         """Set the current game mode."""
         self.game_mode = mode
+        self.simulation.peaceful_mode = mode == GameMode.PEACEFUL
+        if self.navigation_handler:
+            self.navigation_handler.peaceful_mode = self.simulation.peaceful_mode
+        if self.autopilot_worker:
+            self.autopilot_worker.strategy.peaceful_mode = self.simulation.peaceful_mode
+
+
+    def set_background_planning(self, enabled):
+        """Plan autopilot moves on a background thread with the handler's strategy, or on the frame."""
+        self.close()
+        if enabled and self.navigation_handler:
+            strategy = create_strategy(self.navigation_handler.name, self.snake.copy(), self.collision_detector)
+            strategy.peaceful_mode = self.simulation.peaceful_mode
+            self.autopilot_worker = AutopilotWorker(strategy)
+
+
+    def close(self):
+        """Stop the background planning worker, if there is one."""
+        if self.autopilot_worker:
+            self.autopilot_worker.stop()
+            self.autopilot_worker = None
 
 
 # --------------------------------------
 # Input
 # --------------------------------------
-    def handle_input(self, event):
-        """Handle input events during gameplay."""
+    def handle_input(self, event, timestamp=None):
+        """
+        Handle input events during gameplay.
+
+        Args:
+            event (Event): The pygame event.
+            timestamp (float): The earliest time.perf_counter() the key could have been pressed, for its latency. Defaults to now.
+        """
         if event.type != pygame.KEYDOWN:
             self._disable_autopilot(event)
             return GameState.PLAYING
@@ -238,28 +304,33 @@ class PlayingGame:
         elif event.key == pygame.K_F1:
             self._enable_autopilot()
         elif not self.autopilot_enabled:
-            self._handle_snake_direction_input(event)
+            self._handle_snake_direction_input(event, timestamp)
         return GameState.PLAYING
 
 
     def _disable_autopilot(self, event):
         if event.type == pygame.KEYUP and event.key == pygame.K_F1:
             self.autopilot_enabled = False
+            self._cancel_autopilot_plan()
 
 
     def _enable_autopilot(self):
         self.autopilot_enabled = True
+        self.turn_queue.clear()
+        self._cancel_autopilot_plan()
+
+
+    def _cancel_autopilot_plan(self):
+        # A plan made before the toggle is for a board the player may have changed since
+        if self.autopilot_worker:
+            self.autopilot_worker.cancel()
 
 
-    def _handle_snake_direction_input(self, event):
-        if event.key == pygame.K_UP and self.snake.direction != DOWN:
-            self.snake.direction = UP
-        elif event.key == pygame.K_DOWN and self.snake.direction != UP:
-            self.snake.direction = DOWN
-        elif event.key == pygame.K_LEFT and self.snake.direction != RIGHT:
-            self.snake.direction = LEFT
-        elif event.key == pygame.K_RIGHT and self.snake.direction != LEFT:
-            self.snake.direction = RIGHT
+    def _handle_snake_direction_input(self, event, timestamp=None):
+        # Queue the turn, update applies at most one per tick
+        direction = DIRECTION_KEYS.get(event.key)
+        if direction:
+            self.turn_queue.push(direction, self.snake.direction, timestamp)
 
 
 # --------------------------------------
@@ -267,38 +338,47 @@ class PlayingGame:
 # --------------------------------------
     def update(self):
         """Update game logic."""
+        self._apply_queued_turn()
         self._handle_autopilot()
-        head = self._update_snake_position()
-        peaceful_mode = self.game_mode == GameMode.PEACEFUL
-        if peaceful_mode:
-            head = self.collision_detector.wrap_position(head)
-            self.snake.body[0] = head
-        elif self.collision_detector.check_wall_collision(head):
+        events = self.simulation.step()
+        # Score before the alive check, the food that fills the board ends the game
+        self._handle_food_collision(events)
+        if not self.simulation.alive:
             return GameState.GAME_OVER
-        if self.collision_detector.check_self_collision(self.snake, peaceful_mode):
-            return GameState.GAME_OVER
-        self._handle_food_collision(head)
+        self._submit_autopilot()
         return GameState.PLAYING
 
 
-    def _handle_autopilot(self):
-        if self.autopilot_enabled and self.navigation_handler:
-            next_direction = self.navigation_handler.get_next_direction(self.food.position)
-            if next_direction:
-                self.snake.direction = next_direction
-
-
-    def _update_snake_position(self):
-        self.snake.move()
-        head = self.snake.body[0]
-        return head
+    def _apply_queued_turn(self):
+        turn = self.turn_queue.pop_turn(self.snake.direction)
+        if turn:
+            self.snake.direction = turn
+            metrics.INPUT_LATENCY_SECONDS.observe(self.turn_queue.latencies[-1])
 
 
-    def _handle_food_collision(self, head):
-        if self.collision_detector.check_food_collision(head, self.food.position):
-            self.snake.grow()
+    def _handle_autopilot(self):
+        started = time.perf_counter()
+        if self.autopilot_enabled and self.autopilot_worker:
+            self.last_plan = self.autopilot_worker.next_plan(self.snake, self.food.position)
+        elif self.autopilot_enabled and self.navigation_handler:
+            self.last_plan = self.navigation_handler.plan(self.food.position, deadline_after(self.decision_budget))
+        else:
+            self.decision_time = None
+            return
+        self.decision_time = time.perf_counter() - started
+        if self.last_plan.direction:
+            self.snake.direction = self.last_plan.direction
+
+
+    def _submit_autopilot(self):
+        """Start planning the next move in the background as soon as this one is committed."""
+        if self.autopilot_enabled and self.autopilot_worker:
+            self.autopilot_worker.submit(self.snake, self.food.position, self.decision_budget)
+
+
+    def _handle_food_collision(self, events):
+        if StepEvent.ATE in events:
             self.score.increment()
-            self.food.position = self.food.random_position(self.snake)
 
 
 # --------------------------------------
@@ -306,8 +386,7 @@ class PlayingGame:
 # --------------------------------------
     def draw(self, surface):
         """Draw the game elements."""
-        self.snake.draw(surface)
-        self.food.draw(surface)
+        CELL_ATLAS.draw(surface, self.snake, self.food)
 
 
 #endregion
@@ -326,6 +405,8 @@ class PauseMenu:
     Methods:
         handle_input: Handle input events for the pause menu.
         draw: Draw the pause menu on the screen.
+        draw_board: Draw the paused snake and food.
+        draw_overlay: Draw the pause menu text.
     """
 
     def __init__(self, screen_width, screen_height):
@@ -345,8 +426,17 @@ class PauseMenu:
 
     def draw(self, surface, snake, food):
         """Draw the pause menu on the screen."""
-        snake.draw(surface)
-        food.draw(surface)
+        self.draw_board(surface, snake, food)
+        self.draw_overlay(surface)
+
+
+    def draw_board(self, surface, snake, food):
+        """Draw the paused snake and food."""
+        CELL_ATLAS.draw(surface, snake, food)
+
+
+    def draw_overlay(self, surface):
+        """Draw the pause menu text, which never changes and can be cached in a layer."""
         draw_text(surface, "PAUSED", 64, self.screen_width // 2, self.screen_height // 9)
         draw_text(surface, "ESC - Resume | Q - Quit", 32, self.screen_width // 2, self.screen_height // 2)
 
@@ -367,6 +457,8 @@ class GameOver:
     Methods:
         handle_input: Handle input events for the game over screen.
         draw: Draw the game over screen on the screen.
+        draw_static: Draw the parts of the screen that never change.
+        draw_dynamic: Draw the scores.
     """
 
     def __init__(self, screen_width, screen_height):
@@ -392,11 +484,21 @@ class GameOver:
 # --------------------------------------
     def draw(self, surface, score):
         """Draw the game over screen with high scores."""
+        self.draw_static(surface)
+        self.draw_dynamic(surface, score)
+
+
+    def draw_static(self, surface):
+        """Draw the parts of the screen that never change, which can be cached in a layer."""
         self._draw_game_over_text(surface)
+        self._draw_instructions(surface)
+
+
+    def draw_dynamic(self, surface, score):
+        """Draw the high score message, the current score and the high scores."""
         self._draw_high_score_message(surface)
         self._draw_current_score(surface, score)
         self._draw_high_scores(surface, score)
-        self._draw_instructions(surface)
 
 
     def _draw_game_over_text(self, surface):
@@ -0,0 +1,114 @@
+"""
+
+This module contains the grid resolution renderer for the play area.
+
+The board is drawn one pixel per cell into a GRID_WIDTH x GRID_HEIGHT NumPy
+array, pushed to a small surface with pygame.surfarray and scaled up to the
+play area in one operation. Apart from reading the segment positions, the
+cost does not depend on the snake length.
+
+
+Classes:
+    GridRenderer: Class for drawing the snake and food through a grid sized framebuffer.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+from itertools import chain
+
+
+# Third Party
+import numpy as np
+import pygame
+
+
+# Local
+from scripts.constants import GRID_WIDTH, GRID_HEIGHT, CELL_SIZE, BORDER_THICKNESS
+
+
+#endregion
+################################################################################
+#region GridRenderer
+
+
+class GridRenderer:
+    """
+    Draw the snake and food through a grid sized framebuffer.
+
+    The framebuffer is indexed [x, y] like pygame.surfarray. Segments outside
+    the grid, such as the head of a snake that ran into the wall, are not drawn.
+
+    Attributes:
+        grid_width (int): The width of the grid.
+        grid_height (int): The height of the grid.
+        cell_size (int): The size of a cell on screen.
+        origin (tuple): The screen position of the top left cell.
+        frame (ndarray): The (grid_width, grid_height, 3) cell colors of the last frame.
+
+    Methods:
+        draw: Draw the background, snake and food onto a surface.
+        render: Write the background, snake and food colors into the framebuffer.
+        gradient: Return the color of each snake segment, head first.
+    """
+
+    def __init__(self, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT, cell_size=CELL_SIZE, origin=(BORDER_THICKNESS, BORDER_THICKNESS)):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.cell_size = cell_size
+        self.origin = origin
+        self.frame = np.zeros((grid_width, grid_height, 3), dtype=np.uint8)
+        self._small = None
+
+
+    def draw(self, surface, snake, food, background_color):
+        """Draw the background, snake and food onto the play area of a surface."""
+        self.render(snake, food, background_color)
+        size = (self.grid_width * self.cell_size, self.grid_height * self.cell_size)
+        if self._small is None or self._small.get_bitsize() != surface.get_bitsize():
+            self._small = pygame.Surface((self.grid_width, self.grid_height), 0, surface)
+        pygame.surfarray.blit_array(self._small, self.frame)
+        # Scale straight into the play area when the formats match, skipping a screen sized blit
+        play_area = surface.subsurface(pygame.Rect(self.origin, size))
+        if play_area.get_masks() == self._small.get_masks():
+            pygame.transform.scale(self._small, size, play_area)
+        else:
+            surface.blit(pygame.transform.scale(self._small, size), self.origin)
+
+
+    def render(self, snake, food, background_color):
+        """Write the background, snake and food colors into the framebuffer and return it."""
+        frame = self.frame
+        frame[:] = background_color
+        if snake is not None:
+            length = len(snake.body)
+            positions = np.fromiter(chain.from_iterable(snake.body), dtype=np.intp, count=2 * length).reshape(length, 2)
+            colors = self.gradient(snake.theme, length)
+            # Tail first, so segments nearer the head win where they overlap
+            positions, colors = positions[::-1], colors[::-1]
+            x, y = positions[:, 0], positions[:, 1]
+            inside = (x >= 0) & (x < self.grid_width) & (y >= 0) & (y < self.grid_height)
+            frame[x[inside], y[inside]] = colors[inside]
+        if food is not None and food.position is not None:
+            x, y = food.position
+            if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
+                frame[x, y] = food.theme.food_color
+        return frame
+
+
+    def gradient(self, theme, length):
+        """Return the (length, 3) color of each snake segment, head first, blending from the body color at the neck to the tail color."""
+        colors = np.empty((length, 3), dtype=np.uint8)
+        colors[0] = theme.head_color
+        if length > 1:
+            factors = np.arange(length - 1) / (length - 1)
+            body = np.array(theme.body_color, dtype=np.float64)
+            tail = np.array(theme.tail_color, dtype=np.float64)
+            colors[1:] = (body + (tail - body) * factors[:, None]).astype(np.uint8)
+        return colors
+
+
+#endregion
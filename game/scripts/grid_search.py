@@ -0,0 +1,385 @@
+"""
+
+This module contains an allocation-free breadth-first search over the grid.
+
+All per-cell bookkeeping lives in flat arrays that are allocated once per grid
+size. A generation stamp marks which entries belong to the current search, so
+nothing has to be cleared between searches. It does not depend on pygame.
+
+
+Classes:
+    GridSearch: Class for reusable breadth-first searches on one grid size.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import heapq
+import time
+from array import array
+
+
+# Local
+from scripts.constants import DIRECTIONS
+
+
+#endregion
+################################################################################
+#region GridSearch
+
+
+# Searches with a deadline look at the clock once every this many cells, plus one
+DEADLINE_CHECK_MASK = 31
+
+
+class GridSearch:
+    """
+    Reusable breadth-first search on a fixed grid size.
+
+    Cells are addressed by their flat index `y * width + x`. After a search the
+    distance, first move and full path of any visited cell can be read back
+    until the next search starts.
+
+    Attributes:
+        width (int): The width of the grid.
+        height (int): The height of the grid.
+        visited_count (int): The number of cells visited by the last search.
+        tail_reached (bool): Whether the last survey reached its tail position.
+        complete (bool): False if the last survey or A* search ran out of time.
+
+    Methods:
+        search: Search from start until goal is reached or the open cells run out.
+        survey: Search for the goal and tail while measuring the space behind each first move.
+        astar: Search from start to goal guided by a Manhattan distance heuristic.
+        region_size: Return the open space reachable through a first move in the last survey.
+        visited: Check if a position was reached by the last search.
+        distance: Return the number of moves from start to a visited position.
+        first_move: Return the first direction on the path to a visited position.
+        path_to: Return the full list of directions to a visited position.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        cells = width * height
+        self._stamp = array("I", bytes(4 * cells))
+        self._parent = array("i", bytes(4 * cells))
+        self._move = array("b", bytes(cells))
+        self._first = array("b", bytes(cells))
+        self._distance = array("i", bytes(4 * cells))
+        self._queue = array("i", bytes(4 * cells))
+        self._generation = 0
+        self._neighbors = [self._cell_neighbors(cell) for cell in range(cells)]
+        self._wrapped_neighbors = None
+        self._label_root = list(range(len(DIRECTIONS)))
+        self._region_count = [0] * len(DIRECTIONS)
+        self.visited_count = 0
+        self.tail_reached = False
+        self.complete = True
+
+
+    def _cell_neighbors(self, cell, wrap=False):
+        """Return (direction index, neighbor cell) pairs for a cell, in DIRECTIONS order."""
+        y, x = divmod(cell, self.width)
+        neighbors = []
+        for index, (dx, dy) in enumerate(DIRECTIONS):
+            nx, ny = x + dx, y + dy
+            if wrap:
+                nx, ny = nx % self.width, ny % self.height
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                neighbors.append((index, ny * self.width + nx))
+        return tuple(neighbors)
+
+
+    def _cell(self, position):
+        """Return the flat index of a position, or -1 if it is outside the grid."""
+        x, y = position
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return -1
+
+
+    def _next_generation(self):
+        """Start a new search generation, clearing the stamps only when the counter wraps."""
+        self._generation += 1
+        if self._generation > 0xFFFFFFFF:
+            self._stamp = array("I", bytes(4 * self.width * self.height))
+            self._generation = 1
+        return self._generation
+
+
+# --------------------------------------
+# Search
+# --------------------------------------
+    def search(self, start, goal, blocked, passable=None):
+        """
+        Search from start until goal is reached or the open cells run out.
+
+        Args:
+            start (tuple): The start position, always treated as open.
+            goal (tuple): The goal position, or None to visit every reachable cell.
+            blocked (sequence): Per-cell values indexed by flat cell, truthy when the cell is blocked.
+            passable (tuple): An optional position that is treated as open even if blocked.
+
+        Returns:
+            bool: True if the goal was reached.
+        """
+        generation = self._next_generation()
+        stamp, parent, move, first, distance, queue = self._stamp, self._parent, self._move, self._first, self._distance, self._queue
+        neighbors = self._neighbors
+        start_cell = self._cell(start)
+        goal_cell = self._cell(goal) if goal is not None else -1
+        open_cell = self._cell(passable) if passable is not None else -1
+        if start_cell < 0:
+            self.visited_count = 0
+            return False
+        stamp[start_cell] = generation
+        parent[start_cell] = -1
+        first[start_cell] = -1
+        distance[start_cell] = 0
+        queue[0] = start_cell
+        head, tail = 0, 1
+        found = start_cell == goal_cell
+        while head < tail and not found:
+            current = queue[head]
+            head += 1
+            current_first = first[current]
+            next_distance = distance[current] + 1
+            for index, neighbor in neighbors[current]:
+                if stamp[neighbor] == generation or (blocked[neighbor] and neighbor != open_cell):
+                    continue
+                stamp[neighbor] = generation
+                parent[neighbor] = current
+                move[neighbor] = index
+                first[neighbor] = index if current_first < 0 else current_first
+                distance[neighbor] = next_distance
+                queue[tail] = neighbor
+                tail += 1
+                if neighbor == goal_cell:
+                    found = True
+                    break
+        self.visited_count = tail
+        return found
+
+
+    def survey(self, start, goal, blocked, tail=None, limit=None, deadline=None):
+        """
+        Search for the goal and the tail while measuring the space behind each first move.
+
+        Every visited cell is labelled with the first move that reaches it. Two labels
+        belong to the same region when an edge joins their cells, so after the survey
+        region_size(direction) equals a flood fill from the neighbor in that direction
+        with start blocked. The tail is treated as an open dead end: it can be reached
+        but is not expanded or counted.
+
+        Args:
+            start (tuple): The start position, always treated as open.
+            goal (tuple): The goal position, or None.
+            blocked (sequence): Per-cell values indexed by flat cell, truthy when the cell is blocked.
+            tail (tuple): An optional blocked position that may be entered as a last step.
+            limit (int): Stop early once the goal is found and its region holds more than limit cells.
+            deadline (float): Optional time.perf_counter() value to give up at. When it passes,
+                complete is set to False and the region sizes are only lower bounds. The
+                start is always expanded, so every open neighbor has a region even when
+                the deadline has already passed.
+
+        Returns:
+            bool: True if the goal was reached.
+        """
+        generation = self._next_generation()
+        stamp, parent, move, first, distance, queue = self._stamp, self._parent, self._move, self._first, self._distance, self._queue
+        neighbors = self._neighbors
+        label_root = self._label_root
+        region_count = self._region_count
+        for label in range(len(label_root)):
+            label_root[label] = label
+            region_count[label] = 0
+        start_cell = self._cell(start)
+        goal_cell = self._cell(goal) if goal is not None else -1
+        tail_cell = self._cell(tail) if tail is not None else -1
+        self.tail_reached = False
+        self.complete = True
+        if start_cell < 0:
+            self.visited_count = 0
+            return False
+        stamp[start_cell] = generation
+        parent[start_cell] = -1
+        first[start_cell] = -1
+        distance[start_cell] = 0
+        queue[0] = start_cell
+        head, queue_tail = 0, 1
+        found = False
+        while head < queue_tail:
+            if deadline is not None and head and not head & DEADLINE_CHECK_MASK and time.perf_counter() > deadline:
+                self.complete = False
+                break
+            current = queue[head]
+            head += 1
+            current_first = first[current]
+            next_distance = distance[current] + 1
+            for index, neighbor in neighbors[current]:
+                if neighbor == tail_cell:
+                    if stamp[neighbor] != generation:
+                        stamp[neighbor] = generation
+                        parent[neighbor] = current
+                        move[neighbor] = index
+                        first[neighbor] = index if current_first < 0 else current_first
+                        distance[neighbor] = next_distance
+                        self.tail_reached = True
+                    continue
+                if stamp[neighbor] == generation:
+                    if (current_first >= 0 and neighbor != start_cell and
+                            label_root[first[neighbor]] != label_root[current_first]):
+                        self._union_labels(current_first, first[neighbor])
+                    continue
+                if blocked[neighbor]:
+                    continue
+                stamp[neighbor] = generation
+                parent[neighbor] = current
+                move[neighbor] = index
+                label = index if current_first < 0 else current_first
+                first[neighbor] = label
+                region_count[label_root[label]] += 1
+                distance[neighbor] = next_distance
+                queue[queue_tail] = neighbor
+                queue_tail += 1
+                if neighbor == goal_cell:
+                    found = True
+            if found and limit is not None and region_count[label_root[first[goal_cell]]] > limit:
+                break
+        self.visited_count = queue_tail
+        return found
+
+
+    def astar(self, start, goal, blocked, wrap=False, deadline=None):
+        """
+        Search from start to goal guided by a Manhattan distance heuristic.
+
+        On an open board this expands roughly the cells along the path instead of
+        every cell closer than the goal. With wrap the grid is a torus and the
+        heuristic takes the shorter way around each axis.
+
+        Args:
+            start (tuple): The start position, always treated as open.
+            goal (tuple): The goal position.
+            blocked (sequence): Per-cell values indexed by flat cell, truthy when the cell is blocked.
+            wrap (bool): Whether moves wrap around the edges of the grid.
+            deadline (float): Optional time.perf_counter() value to give up at, setting complete to False.
+
+        Returns:
+            bool: True if the goal was reached. visited_count holds the number of expanded cells.
+        """
+        generation = self._next_generation()
+        stamp, parent, move, first, distance = self._stamp, self._parent, self._move, self._first, self._distance
+        if wrap and self._wrapped_neighbors is None:
+            self._wrapped_neighbors = [self._cell_neighbors(cell, wrap=True) for cell in range(self.width * self.height)]
+        neighbors = self._wrapped_neighbors if wrap else self._neighbors
+        width, height = self.width, self.height
+        start_cell = self._cell(start)
+        goal_cell = self._cell(goal)
+        self.visited_count = 0
+        self.complete = True
+        if start_cell < 0 or goal_cell < 0:
+            return False
+        goal_x, goal_y = goal
+
+        def heuristic(cell):
+            y, x = divmod(cell, width)
+            dx, dy = abs(x - goal_x), abs(y - goal_y)
+            if wrap:
+                dx, dy = min(dx, width - dx), min(dy, height - dy)
+            return dx + dy
+
+        stamp[start_cell] = generation
+        parent[start_cell] = -1
+        first[start_cell] = -1
+        distance[start_cell] = 0
+        start_h = heuristic(start_cell)
+        # Ties on f prefer the smaller heuristic, i.e. the node closer to the goal
+        open_heap = [(start_h, start_h, start_cell)]
+        expanded = 0
+        while open_heap:
+            f_score, current_h, current = heapq.heappop(open_heap)
+            current_distance = distance[current]
+            if current == goal_cell:
+                self.visited_count = expanded
+                return True
+            # Skip stale heap entries left behind by a shorter path
+            if current_h + current_distance != f_score:
+                continue
+            expanded += 1
+            if deadline is not None and not expanded & DEADLINE_CHECK_MASK and time.perf_counter() > deadline:
+                self.complete = False
+                break
+            current_first = first[current]
+            next_distance = current_distance + 1
+            for index, neighbor in neighbors[current]:
+                if stamp[neighbor] == generation and distance[neighbor] <= next_distance:
+                    continue
+                if blocked[neighbor]:
+                    continue
+                stamp[neighbor] = generation
+                parent[neighbor] = current
+                move[neighbor] = index
+                first[neighbor] = index if current_first < 0 else current_first
+                distance[neighbor] = next_distance
+                neighbor_h = heuristic(neighbor)
+                heapq.heappush(open_heap, (next_distance + neighbor_h, neighbor_h, neighbor))
+        self.visited_count = expanded
+        return False
+
+
+    def _union_labels(self, label_a, label_b):
+        """Join the regions of two first-move labels, keeping every label pointing at its root."""
+        root_a = self._label_root[label_a]
+        root_b = self._label_root[label_b]
+        self._region_count[root_a] += self._region_count[root_b]
+        self._region_count[root_b] = 0
+        for label, root in enumerate(self._label_root):
+            if root == root_b:
+                self._label_root[label] = root_a
+
+
+# --------------------------------------
+# Results
+# --------------------------------------
+    def region_size(self, direction):
+        """Return the open cells reachable through a first move in the last survey, 0 if there are none."""
+        return self._region_count[self._label_root[DIRECTIONS.index(direction)]]
+
+
+    def visited(self, position):
+        """Check if a position was reached by the last search."""
+        cell = self._cell(position)
+        return cell >= 0 and self._stamp[cell] == self._generation
+
+
+    def distance(self, position):
+        """Return the number of moves from start to a visited position, or None."""
+        if not self.visited(position):
+            return None
+        return self._distance[self._cell(position)]
+
+
+    def first_move(self, position):
+        """Return the first direction on the path to a visited position, or None."""
+        if not self.visited(position):
+            return None
+        index = self._first[self._cell(position)]
+        return DIRECTIONS[index] if index >= 0 else None
+
+
+    def path_to(self, position):
+        """Return the full list of directions from start to a visited position."""
+        if not self.visited(position):
+            return []
+        path = []
+        cell = self._cell(position)
+        while self._parent[cell] >= 0:
+            path.append(DIRECTIONS[self._move[cell]])
+            cell = self._parent[cell]
+        path.reverse()
+        return path
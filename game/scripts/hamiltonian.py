@@ -0,0 +1,284 @@
+"""
+
+This module contains an autopilot that follows a Hamiltonian cycle of the grid.
+
+A Hamiltonian cycle visits every cell once and returns to the start, so a snake
+that keeps its body in cycle order can never trap itself. Shortcuts are only
+taken when they keep that order, which makes every decision a few table lookups.
+A snake taken over mid-game is steered back into that order first. It does not
+depend on pygame.
+
+
+Classes:
+    HamiltonianCycle: Class for a cached Hamiltonian cycle over one grid size.
+    HamiltonianPathfinding: Class for the cycle following autopilot.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import json
+from pathlib import Path
+
+
+# Local
+from scripts.bitboard import Bitboard
+from scripts.constants import DIRECTIONS
+from scripts.navigation import NavigationStrategy, register_strategy
+
+
+#endregion
+################################################################################
+#region HamiltonianCycle
+
+
+CACHE_FOLDER = Path(__file__).resolve().parent.parent / "cache"
+
+
+class HamiltonianCycle:
+    """
+    A Hamiltonian cycle over a grid, computed once per grid size and cached on disk.
+
+    The cycle zig-zags through every column but the first and returns along the
+    first column, which works whenever the height is even (the grid is transposed
+    when only the width is even). Grids with two odd sides have no such cycle.
+
+    Attributes:
+        width (int): The width of the grid.
+        height (int): The height of the grid.
+        size (int): The number of cells on the cycle.
+        order (list): The position on the cycle of each flat cell index.
+        cells (list): The flat cell index at each position on the cycle.
+
+    Methods:
+        exists: Check whether a grid size has a Hamiltonian cycle.
+        load: Return the cycle for a grid size, from memory, disk or a fresh computation.
+        index: Return the position of a cell on the cycle.
+        distance: Return how many steps forward on the cycle it takes to get from one cell to another.
+        next_direction: Return the direction that follows the cycle from a cell.
+    """
+
+    _loaded = {}
+
+    def __init__(self, width, height, cells=None):
+        if not self.exists(width, height):
+            raise ValueError(f"No Hamiltonian cycle exists on a {width}x{height} grid")
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.cells = cells if cells is not None else self._build_cells()
+        self.order = [0] * self.size
+        for index, cell in enumerate(self.cells):
+            self.order[cell] = index
+        self._next_direction = [self._direction_between(cell, self.cells[(self.order[cell] + 1) % self.size]) for cell in range(self.size)]
+
+
+    @staticmethod
+    def exists(width, height):
+        """Check whether a grid size has a Hamiltonian cycle, which needs two sides of at least 2 and one of them even."""
+        return width >= 2 and height >= 2 and not (width % 2 and height % 2)
+
+
+    @classmethod
+    def load(cls, width, height, cache_folder=CACHE_FOLDER):
+        """Return the cycle for a grid size, from memory, disk or a fresh computation."""
+        key = (width, height)
+        if key not in cls._loaded:
+            cache_file = Path(cache_folder) / f"hamiltonian_{width}x{height}.json"
+            cycle = cls._read_cache(cache_file, width, height)
+            if cycle is None:
+                cycle = cls(width, height)
+                cycle._write_cache(cache_file)
+            cls._loaded[key] = cycle
+        return cls._loaded[key]
+
+
+# --------------------------------------
+# Cache
+# --------------------------------------
+    @classmethod
+    def _read_cache(cls, cache_file, width, height):
+        """Read a cached cycle, returning None if it is missing or unusable."""
+        try:
+            with open(cache_file, 'r') as f:
+                data = json.load(f)
+            if data["width"] != width or data["height"] != height:
+                return None
+            cells = data["cells"]
+            if sorted(cells) != list(range(width * height)):
+                return None
+            return cls(width, height, cells)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+
+    def _write_cache(self, cache_file):
+        """Write the cycle to disk, skipping silently if the folder is not writable."""
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump({"width": self.width, "height": self.height, "cells": self.cells}, f)
+        except OSError:
+            pass
+
+
+# --------------------------------------
+# Build
+# --------------------------------------
+    def _build_cells(self):
+        """Build the cycle as a list of flat cell indices."""
+        transpose = self.height % 2 == 1
+        rows, columns = (self.width, self.height) if transpose else (self.height, self.width)
+        path = [(0, 0)]
+        for row in range(rows):
+            span = range(1, columns) if row % 2 == 0 else range(columns - 1, 0, -1)
+            path.extend((column, row) for column in span)
+        path.extend((0, row) for row in range(rows - 1, 0, -1))
+        if transpose:
+            path = [(row, column) for column, row in path]
+        return [y * self.width + x for x, y in path]
+
+
+    def _direction_between(self, cell_a, cell_b):
+        """Return the direction of the step from one cell to an adjacent one."""
+        ay, ax = divmod(cell_a, self.width)
+        by, bx = divmod(cell_b, self.width)
+        return (bx - ax, by - ay)
+
+
+# --------------------------------------
+# Lookup
+# --------------------------------------
+    def index(self, position):
+        """Return the position of a cell on the cycle."""
+        x, y = position
+        return self.order[y * self.width + x]
+
+
+    def distance(self, position_a, position_b):
+        """Return how many steps forward on the cycle it takes to get from one cell to another."""
+        return (self.index(position_b) - self.index(position_a)) % self.size
+
+
+    def next_direction(self, position):
+        """Return the direction that follows the cycle from a cell."""
+        x, y = position
+        return self._next_direction[y * self.width + x]
+
+
+#endregion
+################################################################################
+#region HamiltonianPathfinding
+
+
+@register_strategy("hamiltonian")
+class HamiltonianPathfinding(NavigationStrategy):
+    """
+    Follow a Hamiltonian cycle, taking shortcuts that keep the body in cycle order.
+
+    The body always lies in cycle order from tail to head, so the cells ahead of
+    the head up to the tail are free. A shortcut to a neighbor is only taken when
+    it lands inside that free stretch with room to spare for growth, and never
+    skips past the food. Once the snake covers half the board it just follows
+    the cycle.
+
+    A snake taken over mid-game, such as when the autopilot is switched on, may
+    not be in cycle order. Until it is, the head follows the cycle where the
+    space ahead fits the whole snake and otherwise moves into the largest space.
+
+    Attributes:
+        snake (Snake): The snake object.
+        collision_detector (CollisionDetection): The collision detector object.
+        cycle (HamiltonianCycle): The cycle being followed.
+        bitboard (Bitboard): The grid geometry used to measure free space while realigning.
+
+    Methods:
+        get_next_direction: Calculate the next direction for the snake to move.
+    """
+
+    # Extra free cells to keep between the head and the tail after a shortcut
+    SHORTCUT_MARGIN = 3
+
+    def __init__(self, snake, collision_detector):
+        super().__init__(snake, collision_detector)
+        self.cycle = HamiltonianCycle.load(collision_detector.grid_width, collision_detector.grid_height)
+        self.bitboard = Bitboard(collision_detector.grid_width, collision_detector.grid_height)
+        self._expected_head = None
+
+
+    def _shortcut_budget(self):
+        """Return how far ahead on the cycle the head may jump this tick."""
+        length = len(self.snake.body)
+        if length * 2 > self.cycle.size:
+            return 1
+        head = self.snake.body[0]
+        tail = self.snake.body[-1]
+        gap = self.cycle.distance(head, tail) if length > 1 else self.cycle.size
+        margin = self.SHORTCUT_MARGIN + (1 if self.snake.growing else 0)
+        return max(1, gap - margin)
+
+
+    def _in_cycle_order(self):
+        """Check that the body lies in cycle order from the tail to the head, so the cells ahead of the head are free."""
+        tail = self.snake.body[-1]
+        previous = self.cycle.size
+        for segment in self.snake.body:
+            distance = self.cycle.distance(tail, segment)
+            if distance >= previous:
+                return False
+            previous = distance
+        return True
+
+
+    def _realign_direction(self, head):
+        """Return the cycle move if the space behind it fits the snake, otherwise the move into the largest space."""
+        cycle_direction = self.cycle.next_direction(head)
+        length = len(self.snake.body)
+        open_mask = self.bitboard.full & ~self.snake.occupied_mask
+        best_space, best_direction = 0, cycle_direction
+        for direction in (cycle_direction,) + tuple(DIRECTIONS):
+            position = (head[0] + direction[0], head[1] + direction[1])
+            if self.collision_detector.check_wall_collision(position) or self.snake.occupies(position):
+                continue
+            self.nodes_expanded += 1
+            space = self.bitboard.count(self.bitboard.flood_fill(self.bitboard.bit(position), open_mask, length))
+            if direction == cycle_direction and space > length:
+                return direction
+            if space > best_space:
+                best_space, best_direction = space, direction
+        return best_direction
+
+
+    def get_next_direction(self, food_position):
+        """Calculate the next direction for the snake to move."""
+        head = self.snake.body[0]
+        # The order only has to be checked when the last move was not ours
+        if head != self._expected_head and not self._in_cycle_order():
+            self._expected_head = None
+            return self._realign_direction(head)
+        best_direction = self._follow_cycle(head, food_position)
+        self._expected_head = (head[0] + best_direction[0], head[1] + best_direction[1])
+        return best_direction
+
+
+    def _follow_cycle(self, head, food_position):
+        """Return the cycle move, or the furthest shortcut that keeps the body in cycle order."""
+        best_direction = self.cycle.next_direction(head)
+        budget = self._shortcut_budget()
+        if budget == 1:
+            return best_direction
+        food_distance = self.cycle.distance(head, food_position) if food_position is not None else self.cycle.size
+        best_distance = 1
+        for direction in DIRECTIONS:
+            self.nodes_expanded += 1
+            position = (head[0] + direction[0], head[1] + direction[1])
+            if self.collision_detector.check_wall_collision(position) or self.snake.occupies(position):
+                continue
+            distance = self.cycle.distance(head, position)
+            if best_distance < distance <= min(budget, food_distance):
+                best_direction = direction
+                best_distance = distance
+        return best_direction
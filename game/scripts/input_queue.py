@@ -0,0 +1,120 @@
+"""
+
+This module contains the buffer of turns the player pressed between ticks.
+
+The snake moves once per tick but keys can be pressed at any time, so turns
+are queued with the earliest time they could have been pressed and applied
+one per tick. Each turn is checked against the direction the snake will have
+when it is applied, not the direction it has now. It does not depend on pygame.
+
+
+Classes:
+    TurnQueue: Class for buffering validated turns and measuring their input-to-move latency.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import time
+from collections import deque
+
+
+#endregion
+################################################################################
+#region TurnQueue
+
+
+class TurnQueue:
+    """
+    Buffer the player's turns and apply one per tick.
+
+    A turn is dropped when it keeps the direction it would follow, or reverses
+    it, and when the buffer is full.
+
+    Attributes:
+        max_turns (int): The most turns waiting at once.
+        applied (int): The turns applied so far.
+        dropped (int): The turns dropped so far.
+        latencies (deque): Seconds from the timestamp of each of the last applied turns to the tick that applied it.
+
+    Methods:
+        push: Queue a turn if it is valid after the turns already waiting.
+        pop_turn: Return the next turn to apply this tick, or None.
+        clear: Drop the waiting turns.
+        stats: Return the applied and dropped counts and the latency percentiles.
+    """
+
+    def __init__(self, max_turns=3, history_size=300, clock=time.perf_counter):
+        self.clock = clock
+        self.max_turns = max_turns
+        self.applied = 0
+        self.dropped = 0
+        self.latencies = deque(maxlen=history_size)
+        self._turns = deque()
+
+
+    def __len__(self):
+        return len(self._turns)
+
+
+    def push(self, direction, current_direction, timestamp=None):
+        """
+        Queue a turn if it is valid after the turns already waiting.
+
+        Args:
+            direction (tuple): The direction pressed.
+            current_direction (tuple): The direction the snake is moving in now.
+            timestamp (float): The earliest time the key could have been pressed, on the queue's clock. Defaults to now.
+
+        Returns:
+            bool: Whether the turn was queued.
+        """
+        previous = self._turns[-1][0] if self._turns else current_direction
+        if len(self._turns) >= self.max_turns or not _is_turn(previous, direction):
+            self.dropped += 1
+            return False
+        self._turns.append((direction, self.clock() if timestamp is None else timestamp))
+        return True
+
+
+    def pop_turn(self, current_direction):
+        """Return the next turn that is still valid from the current direction, recording its latency, or None."""
+        while self._turns:
+            direction, timestamp = self._turns.popleft()
+            if _is_turn(current_direction, direction):
+                self.applied += 1
+                self.latencies.append(self.clock() - timestamp)
+                return direction
+            self.dropped += 1
+        return None
+
+
+    def clear(self):
+        """Drop the waiting turns."""
+        self._turns.clear()
+
+
+    def stats(self):
+        """Return the applied and dropped counts and the mean, p50, p99 and max latency in seconds over the history."""
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            "applied": self.applied,
+            "dropped": self.dropped,
+            "waiting": len(self._turns),
+            "latency_mean": sum(latencies) / count if count else 0.0,
+            "latency_p50": latencies[min(count - 1, int(count * 0.50))] if count else 0.0,
+            "latency_p99": latencies[min(count - 1, int(count * 0.99))] if count else 0.0,
+            "latency_max": latencies[-1] if count else 0.0,
+        }
+
+
+def _is_turn(previous, direction):
+    """Return whether moving in a direction after another one changes course without reversing."""
+    return direction != previous and direction != (-previous[0], -previous[1])
+
+
+#endregion
@@ -0,0 +1,103 @@
+"""
+
+This module contains the cache of pre-rendered static screen layers.
+
+
+Classes:
+    StaticLayers: Class for pre-rendering constant parts of the screen once per theme and size.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Third Party
+import pygame
+
+
+#endregion
+################################################################################
+#region StaticLayers
+
+
+class StaticLayers:
+    """
+    Pre-render the constant parts of the screen once per theme and screen size.
+
+    Each layer is drawn by a builder function onto a screen sized surface the
+    first time it is needed, then composited with one blits() call per frame.
+    Transparent layers only blit the bands that hold drawn pixels,
+    since blending a mostly empty screen sized surface costs more than the text
+    on it. Changing the theme drops every layer so they are rebuilt in the new
+    colors.
+
+    Attributes:
+        theme (Theme): The theme the cached layers were drawn with.
+        builds (int): The number of layers drawn so far, for checking the cache works.
+
+    Methods:
+        set_theme: Switch themes, dropping the cached layers if it changed.
+        blit: Draw a layer onto a surface, building it on first use.
+        invalidate: Drop every cached layer.
+    """
+
+    def __init__(self, theme=None):
+        self.theme = theme
+        self.builds = 0
+        self._layers = {}
+
+
+    def set_theme(self, theme):
+        """Switch themes, dropping the cached layers if it changed."""
+        if theme is not self.theme:
+            self.theme = theme
+            self.invalidate()
+
+
+    def blit(self, surface, name, build, opaque=False):
+        """
+        Draw a layer onto a surface, building it on first use.
+
+        Args:
+            surface (Surface): The surface to draw on, whose size the layer matches.
+            name (str): The name of the layer.
+            build (callable): Draws the layer onto the surface it is given.
+            opaque (bool): Whether the layer covers the whole surface, which makes it cheaper to blit.
+        """
+        key = (name, surface.get_size())
+        pieces = self._layers.get(key)
+        if pieces is None:
+            pieces = self._layers[key] = self._build(surface, build, opaque)
+        surface.blits(pieces, False)
+
+
+    def invalidate(self):
+        """Drop every cached layer."""
+        self._layers.clear()
+
+
+    def _build(self, surface, build, opaque):
+        """Draw a layer onto a new surface in the display format and return its blits() sequence."""
+        if opaque:
+            layer = pygame.Surface(surface.get_size())
+        else:
+            layer = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+        build(layer)
+        self.builds += 1
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert() if opaque else layer.convert_alpha()
+        if opaque:
+            return [(layer, (0, 0))]
+        return [(layer, band.topleft, band) for band in self._bands(layer)]
+
+
+    def _bands(self, layer):
+        """Return the rects around the drawn pixels of a transparent layer, merged where their rows overlap."""
+        bands = []
+        for rect in sorted(pygame.mask.from_surface(layer, 0).get_bounding_rects(), key=lambda rect: rect.top):
+            if bands and rect.top <= bands[-1].bottom:
+                bands[-1].union_ip(rect)
+            else:
+                bands.append(rect)
+        return bands
@@ -0,0 +1,268 @@
+"""
+
+This module contains the game metrics and the sinks that export them.
+
+Counters and histograms live in one process-wide registry, so any module can
+record a value with a single attribute update. Sinks read the registry: the
+file sink appends a JSON snapshot to a rotating log, the Prometheus sink
+serves the text exposition format on localhost. It does not depend on pygame.
+
+
+Classes:
+    Counter: Class for a value that only goes up.
+    Histogram: Class for the distribution of observed values over fixed buckets.
+    MetricsRegistry: Class for the named metrics of the game.
+    FileSink: Class for appending snapshots to a rotating local file.
+    PrometheusSink: Class for serving the metrics over HTTP on localhost.
+
+Functions:
+    create_sinks: Create the configured sinks.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+
+
+#endregion
+################################################################################
+#region Metrics
+
+
+# Upper bounds in seconds, for frame and decision times
+TIME_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Counter:
+    """
+    A value that only goes up.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): A one line description.
+        value (float): The current total.
+
+    Methods:
+        inc: Add to the total.
+    """
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+
+    def inc(self, amount=1):
+        """Add to the total."""
+        self.value += amount
+
+
+class Histogram:
+    """
+    The distribution of observed values over fixed buckets.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): A one line description.
+        buckets (tuple): The upper bound of each bucket, in increasing order.
+        counts (list): The observations per bucket, with a last bucket for values above every bound.
+        sum (float): The sum of all observations.
+        count (int): The number of observations.
+
+    Methods:
+        observe: Record a value.
+    """
+
+    def __init__(self, name, help, buckets=TIME_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+    def observe(self, value):
+        """Record a value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    The named metrics of the game.
+
+    Attributes:
+        metrics (dict): The metrics by name, in creation order.
+
+    Methods:
+        counter: Return the counter with a name, creating it if needed.
+        histogram: Return the histogram with a name, creating it if needed.
+        snapshot: Return the current values as plain data.
+        to_prometheus: Return the current values in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+
+
+    def counter(self, name, help=""):
+        """Return the counter with a name, creating it if needed."""
+        if name not in self.metrics:
+            self.metrics[name] = Counter(name, help)
+        return self.metrics[name]
+
+
+    def histogram(self, name, help="", buckets=TIME_BUCKETS):
+        """Return the histogram with a name, creating it if needed."""
+        if name not in self.metrics:
+            self.metrics[name] = Histogram(name, help, buckets)
+        return self.metrics[name]
+
+
+    def snapshot(self):
+        """Return the current values as plain data, with the time they were taken."""
+        data = {"time": time.time()}
+        for name, metric in self.metrics.items():
+            if isinstance(metric, Counter):
+                data[name] = metric.value
+            else:
+                bounds = [str(bound) for bound in metric.buckets] + ["+Inf"]
+                data[name] = {"count": metric.count, "sum": metric.sum, "buckets": dict(zip(bounds, metric.counts))}
+        return data
+
+
+    def to_prometheus(self):
+        """Return the current values in the Prometheus text exposition format."""
+        lines = []
+        for name, metric in list(self.metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            if isinstance(metric, Counter):
+                lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name} {metric.value}")
+                continue
+            lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, count in zip(metric.buckets, metric.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{le="+Inf"}} {metric.count}')
+            lines.append(f"{name}_sum {metric.sum}")
+            lines.append(f"{name}_count {metric.count}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+TICKS = REGISTRY.counter("snake_ticks_total", "Game ticks simulated")
+FRAMES = REGISTRY.counter("snake_frames_total", "Frames rendered")
+FRAME_SECONDS = REGISTRY.histogram("snake_frame_seconds", "Work time per frame, without the wait for the next frame")
+PATHFINDING_SECONDS = REGISTRY.histogram("snake_pathfinding_seconds", "Time the autopilot took to decide a move on the frame")
+INPUT_LATENCY_SECONDS = REGISTRY.histogram("snake_input_latency_seconds", "Time from a turn key press to the tick that moved the snake")
+FOOD_RESPAWN_ATTEMPTS = REGISTRY.counter("snake_food_respawn_attempts_total", "Food positions drawn")
+MUSIC_TRACK_LOADS = REGISTRY.counter("snake_music_track_loads_total", "Music tracks loaded")
+MUSIC_PREFETCH_WAITS = REGISTRY.counter("snake_music_prefetch_waits_total", "Track changes that waited for the next track to be read")
+
+
+#endregion
+################################################################################
+#region Sinks
+
+
+class FileSink:
+    """
+    Append JSON snapshots of the registry to a local file that rotates by size.
+
+    Attributes:
+        path (str): The file to write.
+
+    Methods:
+        publish: Append a snapshot of the registry.
+        close: Close the file.
+    """
+
+    def __init__(self, path, max_bytes=1_000_000, backup_count=3):
+        self.path = path
+        self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+
+
+    def publish(self, registry):
+        """Append a snapshot of the registry as one JSON line."""
+        self._handler.handle(logging.makeLogRecord({"msg": json.dumps(registry.snapshot())}))
+
+
+    def close(self):
+        """Close the file."""
+        self._handler.close()
+
+
+class PrometheusSink:
+    """
+    Serve the registry in the Prometheus text format on localhost, from a background thread.
+
+    Scrapers read the live registry, so publish does nothing.
+
+    Attributes:
+        address (tuple): The host and port being served.
+
+    Methods:
+        publish: Do nothing, the registry is read when scraped.
+        close: Stop the server.
+    """
+
+    def __init__(self, registry, port, host="127.0.0.1"):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self.address = self._server.server_address
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+
+
+    def publish(self, registry):
+        """Do nothing, the registry is read when scraped."""
+
+
+    def close(self):
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def create_sinks(path=None, port=None, registry=REGISTRY):
+    """Create a file sink if a path is given and a localhost Prometheus sink if a port is given, skipping any that fail to open."""
+    sinks = []
+    if path:
+        try:
+            sinks.append(FileSink(path))
+        except OSError as e:
+            print(f"Error opening metrics file: {e}")
+    if port:
+        try:
+            sinks.append(PrometheusSink(registry, port))
+        except (OSError, OverflowError) as e:
+            print(f"Error starting metrics server: {e}")
+    return sinks
@@ -0,0 +1,166 @@
+"""
+
+This module contains the autopilot strategy interface and registry.
+
+A strategy decides the next direction of a snake given the food position.
+Strategies register themselves under a name so the demo and the F1 autopilot
+can pick one from configuration. It does not depend on pygame.
+
+
+Classes:
+    PlanResult: The direction chosen by a strategy and whether the search finished.
+    NavigationStrategy: Base class for autopilot strategies.
+
+Functions:
+    deadline_after: Return the deadline for a time budget.
+    quick_safe_direction: Return a free move without searching, for when no plan is ready.
+    register_strategy: Class decorator that registers a strategy under a name.
+    get_strategy: Return the strategy class registered under a name.
+    create_strategy: Create a strategy by name for a snake.
+    available_strategies: Return the names of all registered strategies.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import importlib
+import time
+from collections import namedtuple
+
+
+# Local
+from scripts.constants import UP, DOWN, LEFT, RIGHT
+
+
+#endregion
+################################################################################
+#region NavigationStrategy
+
+
+PlanResult = namedtuple("PlanResult", ["direction", "complete"])
+
+
+class NavigationStrategy:
+    """
+    Base class for autopilot strategies.
+
+    Attributes:
+        name (str): The name the strategy is registered under.
+        snake (SnakeBody): The snake being steered.
+        collision_detector (CollisionDetection): The collision detector, which also holds the grid size.
+        peaceful_mode (bool): Whether the snake wraps around the edges.
+        nodes_expanded (int): The number of grid cells the strategy has expanded, for comparing costs.
+        incomplete_plans (int): The number of plans that ran out of time.
+
+    Methods:
+        get_next_direction: Calculate the next direction for the snake to move.
+        plan: Calculate the next direction within a deadline and report whether the search finished.
+    """
+
+    name = None
+
+    def __init__(self, snake, collision_detector):
+        self.snake = snake
+        self.collision_detector = collision_detector
+        self.peaceful_mode = False
+        self.nodes_expanded = 0
+        self.incomplete_plans = 0
+
+
+    def get_next_direction(self, food_position):
+        """Calculate the next direction for the snake to move, or None to keep going straight."""
+        raise NotImplementedError
+
+
+    def plan(self, food_position, deadline=None):
+        """
+        Calculate the next direction within a deadline and report whether the search finished.
+
+        Strategies that can run long override this to return the best safe move found
+        so far once time.perf_counter() passes the deadline. The default simply runs
+        get_next_direction, which is right for strategies with a constant cost.
+
+        Returns:
+            PlanResult: The direction (None to keep going straight) and whether the search completed.
+        """
+        return PlanResult(self.get_next_direction(food_position), True)
+
+
+def deadline_after(budget):
+    """Return the time.perf_counter() deadline for a budget in seconds, or None for no budget."""
+    if budget is None:
+        return None
+    return time.perf_counter() + budget
+
+
+def quick_safe_direction(snake, collision_detector, food_position=None, peaceful_mode=False):
+    """
+    Return a free move without searching, for when no plan is ready.
+
+    Keeps the current direction if the next cell is free, otherwise takes the free
+    move closest to the food. Returns None if every move is blocked.
+    """
+    head = snake.body[0]
+    best_direction = None
+    best_distance = None
+    for direction in (snake.direction, UP, DOWN, LEFT, RIGHT):
+        position = (head[0] + direction[0], head[1] + direction[1])
+        if peaceful_mode:
+            position = collision_detector.wrap_position(position)
+        elif collision_detector.check_wall_collision(position):
+            continue
+        if snake.occupies(position):
+            continue
+        if direction == snake.direction:
+            return direction
+        distance = abs(position[0] - food_position[0]) + abs(position[1] - food_position[1]) if food_position else 0
+        if best_distance is None or distance < best_distance:
+            best_direction, best_distance = direction, distance
+    return best_direction
+
+
+#endregion
+################################################################################
+#region Registry
+
+
+# Modules that register the built-in strategies when imported
+BUILTIN_STRATEGY_MODULES = ("scripts.pathfinding", "scripts.hamiltonian", "scripts.astar")
+STRATEGIES = {}
+
+
+def register_strategy(name):
+    """Class decorator that registers a strategy under a name."""
+    def decorator(cls):
+        cls.name = name
+        STRATEGIES[name] = cls
+        return cls
+    return decorator
+
+
+def _load_builtin_strategies():
+    """Import the built-in strategy modules so they register themselves."""
+    for module in BUILTIN_STRATEGY_MODULES:
+        importlib.import_module(module)
+
+
+def get_strategy(name):
+    """Return the strategy class registered under a name."""
+    _load_builtin_strategies()
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown autopilot strategy: {name!r} (available: {', '.join(available_strategies())})")
+    return STRATEGIES[name]
+
+
+def create_strategy(name, snake, collision_detector):
+    """Create a strategy by name for a snake."""
+    return get_strategy(name)(snake, collision_detector)
+
+
+def available_strategies():
+    """Return the names of all registered strategies."""
+    _load_builtin_strategies()
+    return sorted(STRATEGIES)
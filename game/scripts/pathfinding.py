@@ -0,0 +1,241 @@
+"""
+
+This module contains the autopilot pathfinding used by the demo and the F1 autopilot.
+
+It does not depend on pygame, so it can run in headless workers.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Local
+from scripts.constants import UP, DOWN, LEFT, RIGHT
+from scripts.bitboard import Bitboard
+from scripts.grid_search import GridSearch
+from scripts.navigation import NavigationStrategy, PlanResult, register_strategy
+
+
+#endregion
+################################################################################
+#region Pathfinding
+
+
+@register_strategy("bfs")
+class Pathfinding(NavigationStrategy):
+    """
+    Handle pathfinding for the snake.
+
+    The path to the food is cached and followed while the food stays put and
+    the snake keeps to it. Each cached step only costs a bounded flood fill to
+    confirm it is still safe, and a new plan is made with a single survey.
+
+    With a deadline (see plan) an unfinished survey falls back to the free move
+    with the most space seen so far, so a decision never overruns the frame.
+
+    When no move has room for the body the snake follows its tail, but only for
+    as many ticks without eating as the grid has cells, so it cannot circle forever.
+
+    Attributes:
+        snake (Snake): The snake object.
+        collision_detector (CollisionDetection): The collision detector object.
+        bitboard (Bitboard): The bitboard geometry of the grid, used for flood fills.
+        grid_search (GridSearch): The reusable breadth-first search kernel.
+        replan_count (int): The number of decisions that needed a new plan.
+        ticks_since_food (int): The decisions made since the snake last grew.
+        tail_follow_limit (int): The most ticks without eating the snake may keep following its tail.
+
+    Methods:
+        _is_valid_move: Check if a position is within the grid and not part of the snake.
+        _flood_fill: Count the number of accessible cells from a starting position.
+        _bfs: Breadth-first search to find the shortest path to the goal.
+        _bfs_first_move: Breadth-first search that only returns the first move to the goal.
+        _survey: Search for the food and tail and measure the space behind each move, in one pass.
+        _get_safe_direction: Find the direction with the largest accessible space.
+        _plan_to_food: Find a safe path to the food and cache it.
+        _get_fallback_direction: Pick a move when the food is out of reach or unsafe.
+        _get_greedy_direction: Pick the free move closest to the food when the survey ran out of time.
+        _next_planned_move: Return the next move of the cached plan if it is still valid.
+        _advance_plan: Step the cached plan forward after committing to a move.
+        get_next_direction: Calculate the next direction for the snake to move.
+        plan: Calculate the next direction within a deadline and report whether the search finished.
+    """
+
+    def __init__(self, snake, collision_detector):
+        super().__init__(snake, collision_detector)
+        self.bitboard = Bitboard(collision_detector.grid_width, collision_detector.grid_height)
+        self.grid_search = GridSearch(collision_detector.grid_width, collision_detector.grid_height)
+        self.replan_count = 0
+        self.ticks_since_food = 0
+        self.tail_follow_limit = collision_detector.grid_width * collision_detector.grid_height
+        self._fed_length = None
+        self._plan = []
+        self._plan_index = 0
+        self._plan_food = None
+        self._plan_head = None
+        self._surveyed = False
+        self._deadline = None
+        self._complete = True
+
+
+    def _is_valid_move(self, position):
+        """Check if a position is within the grid and not part of the snake."""
+        x, y = position
+        return (0 <= x < self.collision_detector.grid_width and
+                0 <= y < self.collision_detector.grid_height and
+                not self.snake.occupies(position))
+
+
+    def _flood_fill(self, start, limit=None):
+        """Count the number of accessible cells from a starting position, stopping past limit if given."""
+        open_mask = self.bitboard.full & ~self.snake.occupied_mask
+        reach = self.bitboard.flood_fill(self.bitboard.bit(start), open_mask, limit)
+        return self.bitboard.count(reach)
+
+
+    def _bfs(self, start, goal):
+        """Breadth-first search to find the shortest path to the goal."""
+        if start == goal or not self.grid_search.search(start, goal, self.snake.occupancy_grid()):
+            return []
+        return self.grid_search.path_to(goal)
+
+
+    def _bfs_first_move(self, start, goal):
+        """Breadth-first search that only returns the first move to the goal, or None."""
+        if start == goal or not self.grid_search.search(start, goal, self.snake.occupancy_grid()):
+            return None
+        return self.grid_search.first_move(goal)
+
+
+    def _survey(self, head, food_position, limit=None):
+        """Search for the food and tail and measure the space behind each move, in one pass."""
+        # The tail only moves out of the way if the snake is not about to grow
+        tail = self.snake.body[-1] if len(self.snake.body) > 1 and not self.snake.growing else None
+        found = self.grid_search.survey(head, food_position, self.snake.occupancy_grid(), tail, limit, self._deadline)
+        self.nodes_expanded += self.grid_search.visited_count
+        self._surveyed = True
+        self._complete = self._complete and self.grid_search.complete
+        return found
+
+
+    def _get_safe_direction(self, head):
+        """Find the direction with the largest accessible space, using the last complete survey."""
+        safe_moves = []
+        for direction in [UP, DOWN, LEFT, RIGHT]:
+            next_position = (head[0] + direction[0], head[1] + direction[1])
+            if self._is_valid_move(next_position):
+                space = self.grid_search.region_size(direction)
+                safe_moves.append((space, direction))
+        return max(safe_moves)[1] if safe_moves else None
+
+
+    def _step(self, position, direction):
+        """Return the position one move away, wrapped around the edges in peaceful mode."""
+        position = (position[0] + direction[0], position[1] + direction[1])
+        if self.peaceful_mode:
+            return self.collision_detector.wrap_position(position)
+        return position
+
+
+# --------------------------------------
+# Plan cache
+# --------------------------------------
+    def _next_planned_move(self, head, food_position):
+        """Return the next move of the cached plan if it is still valid, otherwise None."""
+        if (self._plan_index >= len(self._plan) or
+                food_position != self._plan_food or
+                head != self._plan_head):
+            return None
+        move = self._plan[self._plan_index]
+        if not self._is_valid_move(self._step(head, move)):
+            return None
+        return move
+
+
+    def _advance_plan(self, head, move):
+        """Step the cached plan forward after committing to a move."""
+        self._plan_index += 1
+        self._plan_head = self._step(head, move)
+        return move
+
+
+    def _plan_to_food(self, head, food_position, limit):
+        """Find a path to the food that leaves room for the body, cache it and return its first move."""
+        if self._survey(head, food_position, limit) and food_position is not None and self.grid_search.complete:
+            food_move = self.grid_search.first_move(food_position)
+            if food_move and self.grid_search.region_size(food_move) > limit:
+                self._plan = self.grid_search.path_to(food_position)
+                self._plan_food = food_position
+                return food_move
+        return None
+
+
+    def _get_fallback_direction(self, head, food_position, limit):
+        """Pick a move when the food is out of reach, unsafe or the survey ran out of time."""
+        if not self._surveyed:
+            self._survey(head, None)
+        if not self.grid_search.complete and food_position is not None:
+            return self._get_greedy_direction(head, food_position, limit)
+        # Move towards the most space
+        safe_direction = self._get_safe_direction(head)
+        if safe_direction and self.grid_search.region_size(safe_direction) > limit:
+            return safe_direction
+        # If there is not enough space anywhere, follow the tail out of it, unless it has been circling too long
+        if self.grid_search.tail_reached and self.ticks_since_food < self.tail_follow_limit:
+            return self.grid_search.first_move(self.snake.body[-1])
+        return safe_direction
+
+
+    def _get_greedy_direction(self, head, food_position, limit):
+        """Pick the free move closest to the food, preferring moves already known to have room for the body."""
+        best_direction = None
+        best_key = None
+        for direction in [UP, DOWN, LEFT, RIGHT]:
+            next_position = self._step(head, direction)
+            if not self._is_valid_move(next_position):
+                continue
+            space = self.grid_search.region_size(direction)
+            distance = abs(next_position[0] - food_position[0]) + abs(next_position[1] - food_position[1])
+            key = (space > limit, -distance, space)
+            if best_key is None or key > best_key:
+                best_direction, best_key = direction, key
+        return best_direction
+
+
+    def get_next_direction(self, food_position):
+        """Calculate the next direction for the snake to move."""
+        head = self.snake.body[0]
+        limit = len(self.snake.body)
+        if limit != self._fed_length:
+            self._fed_length = limit
+            self.ticks_since_food = 0
+        else:
+            self.ticks_since_food += 1
+        # Keep following the cached path to the food while it is still safe
+        planned_move = self._next_planned_move(head, food_position)
+        if planned_move and self._flood_fill(self._step(head, planned_move), limit) > limit:
+            return self._advance_plan(head, planned_move)
+        self._plan = []
+        self._plan_index = 0
+        self._surveyed = False
+        self.replan_count += 1
+        # If path to food is safe, cache it and follow it
+        food_move = self._plan_to_food(head, food_position, limit)
+        if food_move:
+            return self._advance_plan(head, food_move)
+        # If path to food is not safe, follow the space or the tail
+        return self._get_fallback_direction(head, food_position, limit)
+
+
+    def plan(self, food_position, deadline=None):
+        """Calculate the next direction within a deadline and report whether the search finished."""
+        self._deadline = deadline
+        self._complete = True
+        try:
+            direction = self.get_next_direction(food_position)
+        finally:
+            self._deadline = None
+        if not self._complete:
+            self.incomplete_plans += 1
+        return PlanResult(direction, self._complete)
@@ -0,0 +1,146 @@
+"""
+
+This module contains the in-game performance overlay.
+
+
+Classes:
+    PerfOverlay: Class for drawing live frame timings and dumping them to CSV.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import csv
+import time
+
+
+# Third Party
+import pygame
+
+
+# Local
+from scripts.constants import WHITE, YELLOW, RED, GREEN
+from scripts.draw_text import TEXT_CACHE
+
+
+#endregion
+################################################################################
+#region PerfOverlay
+
+
+class PerfOverlay:
+    """
+    Draw live frame timings from a FrameTimer over the game.
+
+    The overlay uses a plain font without the outline of draw_text, so showing
+    it adds as little as possible to the frame it is measuring.
+
+    Attributes:
+        frame_timer (FrameTimer): The timer whose history is shown.
+        enabled (bool): Whether the overlay is drawn.
+        graph_frames (int): The number of recent frames shown in the graph.
+
+    Methods:
+        toggle: Show or hide the overlay.
+        draw: Draw the overlay on a surface.
+        dump_csv: Write the timed frames in the history to a CSV file.
+    """
+
+    def __init__(self, frame_timer, graph_frames=120, x=24, y=24):
+        self.frame_timer = frame_timer
+        self.enabled = False
+        self.graph_frames = graph_frames
+        self.x = x
+        self.y = y
+        self._font = None
+
+
+    def toggle(self):
+        """Show or hide the overlay."""
+        self.enabled = not self.enabled
+
+
+# --------------------------------------
+# Draw
+# --------------------------------------
+    def draw(self, surface, actual_fps, target_fps, decision_time, snake_length, timestep_stats=None, input_stats=None):
+        """
+        Draw the overlay on a surface.
+
+        Args:
+            actual_fps (float): The measured frame rate.
+            target_fps (int): The frame rate the game is trying to hold.
+            decision_time (float): Seconds the last autopilot decision took, None if there was none.
+            snake_length (int): The length of the snake on screen.
+            timestep_stats (dict): FixedTimestep.stats() in the fixed loop mode, None otherwise.
+            input_stats (dict): TurnQueue.stats() of the game being played, None in the menu.
+        """
+        if self._font is None:
+            self._font = pygame.font.Font(None, 20)
+        averages = self.frame_timer.averages()
+        render = sum(averages.get(phase, 0.0) for phase in ("background", "text", "snake", "overlay"))
+        decision = f"{decision_time * 1000:.2f} ms" if decision_time is not None else "-"
+        lines = [
+            (f"FPS {actual_fps:.1f} / {target_fps}", GREEN if actual_fps >= target_fps * 0.95 else RED),
+            (f"input {self._ms(averages, 'input')}  update {self._ms(averages, 'update')}", WHITE),
+            (f"render {render * 1000:.2f} ms  flip {self._ms(averages, 'flip')}", WHITE),
+            (f"autopilot {decision}  length {snake_length}", WHITE),
+            (f"text cache {TEXT_CACHE.stats()['hit_rate']:.0%} hits, {TEXT_CACHE.size_bytes // 1024} KB", WHITE),
+        ]
+        if timestep_stats is not None:
+            lines.append((f"jitter tick {timestep_stats['tick_jitter'] * 1000:.2f} ms  frame {timestep_stats['frame_jitter'] * 1000:.2f} ms", WHITE))
+        if input_stats is not None:
+            lines.append((f"input p50 {input_stats['latency_p50'] * 1000:.1f} p99 {input_stats['latency_p99'] * 1000:.1f} ms  dropped {input_stats['dropped']}", WHITE))
+        width = 230
+        height = len(lines) * 18 + 50
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        for i, (text, color) in enumerate(lines):
+            panel.blit(self._font.render(text, True, color), (6, 4 + i * 18))
+        self._draw_graph(panel, pygame.Rect(6, height - 44, width - 12, 40), target_fps)
+        surface.blit(panel, (self.x, self.y))
+
+
+    def _draw_graph(self, panel, rect, target_fps):
+        """Draw the work time of recent frames as bars, scaled so the frame budget is the full height."""
+        budget = 1.0 / target_fps if target_fps else 0.1
+        frames = list(self.frame_timer.history)[-self.graph_frames:]
+        bar_width = max(1, rect.width // self.graph_frames)
+        for i, frame in enumerate(frames):
+            share = min(1.0, frame["frame"] / budget)
+            bar_height = max(1, int(share * rect.height))
+            color = RED if share >= 1.0 else YELLOW if share >= 0.5 else GREEN
+            pygame.draw.rect(panel, color, pygame.Rect(rect.x + i * bar_width, rect.bottom - bar_height, bar_width, bar_height))
+        pygame.draw.rect(panel, WHITE, rect, 1)
+
+
+    def _ms(self, averages, phase):
+        """Format the mean time of a phase in milliseconds."""
+        return f"{averages.get(phase, 0.0) * 1000:.2f} ms"
+
+
+# --------------------------------------
+# Export
+# --------------------------------------
+    def dump_csv(self, path=None):
+        """Write the timed frames in the history to a CSV file, one row per frame, and return its path, or None if it could not be written."""
+        if path is None:
+            path = time.strftime("frame_times_%Y%m%d_%H%M%S.csv")
+        frames = list(self.frame_timer.history)
+        phases = []
+        for frame in frames:
+            phases.extend(phase for phase in frame if phase not in phases)
+        try:
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame"] + [f"{phase}_ms" for phase in phases])
+                first = self.frame_timer.frame_count - len(frames)
+                for i, frame in enumerate(frames):
+                    writer.writerow([first + i] + [f"{frame.get(phase, 0.0) * 1000:.4f}" for phase in phases])
+        except OSError as e:
+            print(f"Error writing frame times: {e}")
+            return None
+        return path
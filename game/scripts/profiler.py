@@ -0,0 +1,78 @@
+"""
+
+This module contains an on-demand cProfile wrapper for the game loop.
+
+
+Classes:
+    LoopProfiler: Class for starting and stopping cProfile and writing each session to disk.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import cProfile
+import time
+
+
+#endregion
+################################################################################
+#region LoopProfiler
+
+
+class LoopProfiler:
+    """
+    Start and stop cProfile on the game loop thread and write each session to disk.
+
+    Sessions are written in the pstats format, readable with `python -m pstats`
+    or snakeviz.
+
+    Attributes:
+        path (str): The file to write, None for a timestamped name per session.
+        running (bool): Whether a session is being recorded.
+
+    Methods:
+        start: Start recording a session.
+        stop: Stop recording and write the session, returning its path.
+        toggle: Start or stop a session, returning the written path when stopping.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.running = False
+        self._profile = None
+
+
+    def start(self):
+        """Start recording a session."""
+        if self.running:
+            return
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        self.running = True
+
+
+    def stop(self):
+        """Stop recording and write the session, returning its path, or None if nothing was running or it could not be written."""
+        if not self.running:
+            return None
+        self._profile.disable()
+        self.running = False
+        path = self.path or time.strftime("snake_profile_%Y%m%d_%H%M%S.prof")
+        try:
+            self._profile.dump_stats(path)
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+            path = None
+        self._profile = None
+        return path
+
+
+    def toggle(self):
+        """Start or stop a session, returning the written path when stopping."""
+        if self.running:
+            return self.stop()
+        self.start()
+        return None
@@ -0,0 +1,458 @@
+"""
+
+This module contains the headless simulation core of the game.
+
+Nothing in this module depends on pygame or a display, so it can be imported
+and stepped by workers that only need the game rules.
+
+
+Classes:
+    StepEvent: Enum class for the events produced by a simulation step.
+    FreeCells: Class for the set of grid cells not covered by the snake.
+    SnakeSegments: Class for a read-only view of the snake body.
+    SnakeBody: Class for the snake state and movement.
+    FoodSpawner: Class for the food state and placement.
+    Simulation: Class for advancing a game by one tick at a time.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import random
+from array import array
+from enum import Enum
+
+
+# Local
+from scripts.constants import RIGHT, GRID_WIDTH, GRID_HEIGHT
+from scripts.collision_detection import CollisionDetection
+
+
+#endregion
+################################################################################
+#region StepEvent
+
+
+class StepEvent(Enum):
+    """For tracking what happened during a simulation step."""
+    MOVED = 1
+    ATE = 2
+    DIED_WALL = 3
+    DIED_SELF = 4
+    WON = 5
+
+
+DEATH_EVENTS = (StepEvent.DIED_WALL, StepEvent.DIED_SELF)
+
+
+#endregion
+################################################################################
+#region FreeCells
+
+
+class FreeCells:
+    """
+    Track the grid cells that are not covered by the snake.
+
+    The free cells are kept in a dense array with a cell -> slot map, so adding,
+    removing (swap with the last slot) and uniform sampling are all constant time.
+
+    Attributes:
+        grid_width (int): The width of the grid.
+        grid_height (int): The height of the grid.
+
+    Methods:
+        add: Mark a cell as free.
+        remove: Mark a cell as taken.
+        sample: Return a uniformly random free position, or None if there is none.
+        copy: Return an independent copy of the free cells.
+    """
+
+    def __init__(self, grid_width, grid_height):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self._cells = array("i", range(grid_width * grid_height))
+        self._slots = array("i", range(grid_width * grid_height))
+        self._count = grid_width * grid_height
+
+
+    def __len__(self):
+        return self._count
+
+
+    def __contains__(self, position):
+        x, y = position
+        if not (0 <= x < self.grid_width and 0 <= y < self.grid_height):
+            return False
+        return self._slots[y * self.grid_width + x] >= 0
+
+
+    def add(self, cell):
+        """Mark a flat cell index as free."""
+        if self._slots[cell] >= 0:
+            return
+        self._cells[self._count] = cell
+        self._slots[cell] = self._count
+        self._count += 1
+
+
+    def remove(self, cell):
+        """Mark a flat cell index as taken."""
+        slot = self._slots[cell]
+        if slot < 0:
+            return
+        self._count -= 1
+        last = self._cells[self._count]
+        self._cells[slot] = last
+        self._slots[last] = slot
+        self._slots[cell] = -1
+
+
+    def copy(self):
+        """Return an independent copy of the free cells."""
+        clone = FreeCells.__new__(FreeCells)
+        clone.grid_width = self.grid_width
+        clone.grid_height = self.grid_height
+        clone._cells = array("i", self._cells)
+        clone._slots = array("i", self._slots)
+        clone._count = self._count
+        return clone
+
+
+    def sample(self, rng):
+        """Return a uniformly random free position, or None if there is none."""
+        if not self._count:
+            return None
+        y, x = divmod(self._cells[rng.randrange(self._count)], self.grid_width)
+        return (x, y)
+
+
+#endregion
+################################################################################
+#region SnakeBody
+
+
+class SnakeSegments:
+    """
+    Read-only view of the snake body, head first.
+
+    Supports len(), indexing, slicing, iteration and constant time `in` checks
+    so it can be used anywhere the old body list was used.
+    """
+
+    __slots__ = ("_snake",)
+
+    def __init__(self, snake):
+        self._snake = snake
+
+
+    def __len__(self):
+        return self._snake._length
+
+
+    def __getitem__(self, index):
+        snake = self._snake
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(snake._length))]
+        if index < 0:
+            index += snake._length
+        if not 0 <= index < snake._length:
+            raise IndexError("snake segment index out of range")
+        return snake._ring[(snake._head_index + index) % len(snake._ring)]
+
+
+    def __iter__(self):
+        snake = self._snake
+        ring = snake._ring
+        capacity = len(ring)
+        start = snake._head_index
+        for i in range(snake._length):
+            yield ring[(start + i) % capacity]
+
+
+    def __reversed__(self):
+        snake = self._snake
+        ring = snake._ring
+        capacity = len(ring)
+        start = snake._head_index
+        for i in range(snake._length - 1, -1, -1):
+            yield ring[(start + i) % capacity]
+
+
+    def __contains__(self, position):
+        return self._snake.occupies(position)
+
+
+    def __repr__(self):
+        return f"SnakeSegments({list(self)!r})"
+
+
+class SnakeBody:
+    """
+    Handle the snake state without any rendering.
+
+    The segments are stored in a ring buffer so moving only writes the new
+    head and releases the tail, and a grid of occupancy counts answers "is
+    this cell part of the snake" in constant time. Counts rather than flags
+    keep the grid correct while the snake overlaps itself in peaceful mode.
+
+    Attributes:
+        body (SnakeSegments): The body segments, head first.
+        free_cells (FreeCells): The grid cells the snake does not cover.
+        occupied_mask (int): Bitboard of the grid cells the snake covers.
+        direction (tuple): The current direction the snake is moving.
+        growing (bool): Whether the snake is growing.
+        grid_width (int): The width of the grid.
+        grid_height (int): The height of the grid.
+
+    Methods:
+        move: Move the snake in the current direction.
+        grow: Grow the snake by one segment.
+        head: Return the head position.
+        tail: Return the tail position.
+        occupancy: Return how many segments cover a position.
+        occupancy_grid: Return the per-cell occupancy counts, indexed by flat cell.
+        occupies: Check if a position is part of the snake.
+        is_self_colliding: Check if the head overlaps another segment.
+        copy: Return an independent snapshot of the snake state.
+    """
+
+    def __init__(self, start=(10, 10), direction=RIGHT, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT):
+        self.direction = direction
+        self.growing = False
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self._ring = [None] * max(4, grid_width * grid_height)
+        self._head_index = 0
+        self._length = 0
+        self._occupancy = array("I", bytes(4 * grid_width * grid_height))
+        self._outside = 0
+        self.free_cells = FreeCells(grid_width, grid_height)
+        self.occupied_mask = 0
+        self.body = SnakeSegments(self)
+        self._push_head(start)
+
+
+    def move(self, peaceful_mode=False):
+        """Move snake by one step."""
+        head = self._ring[self._head_index]
+        new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
+        if peaceful_mode:
+            new_head = (new_head[0] % self.grid_width, new_head[1] % self.grid_height)
+        self._push_head(new_head)
+        if not self.growing:
+            self._pop_tail()
+        else:
+            self.growing = False
+
+
+    def grow(self):
+        """Grow the snake by one segment."""
+        self.growing = True
+
+
+    def head(self):
+        """Return the head position."""
+        return self._ring[self._head_index]
+
+
+    def tail(self):
+        """Return the tail position."""
+        return self._ring[(self._head_index + self._length - 1) % len(self._ring)]
+
+
+    def copy(self):
+        """Return an independent snapshot of the snake state, as a plain SnakeBody."""
+        clone = SnakeBody.__new__(SnakeBody)
+        clone.direction = self.direction
+        clone.growing = self.growing
+        clone.grid_width = self.grid_width
+        clone.grid_height = self.grid_height
+        clone._ring = self._ring[:]
+        clone._head_index = self._head_index
+        clone._length = self._length
+        clone._occupancy = array("I", self._occupancy)
+        clone._outside = self._outside
+        clone.free_cells = self.free_cells.copy()
+        clone.occupied_mask = self.occupied_mask
+        clone.body = SnakeSegments(clone)
+        return clone
+
+
+# --------------------------------------
+# Occupancy
+# --------------------------------------
+    def occupancy(self, position):
+        """Return how many segments cover a position."""
+        x, y = position
+        if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
+            return self._occupancy[y * self.grid_width + x]
+        if not self._outside:
+            return 0
+        return sum(1 for segment in self.body if segment == position)
+
+
+    def occupancy_grid(self):
+        """Return the per-cell occupancy counts, indexed by `y * grid_width + x`. Do not modify."""
+        return self._occupancy
+
+
+    def occupies(self, position):
+        """Check if a position is part of the snake."""
+        x, y = position
+        if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
+            return self._occupancy[y * self.grid_width + x] > 0
+        return self._outside > 0 and self.occupancy(position) > 0
+
+
+    def is_self_colliding(self):
+        """Check if the head overlaps another segment."""
+        return self.occupancy(self.head()) > 1
+
+
+# --------------------------------------
+# Ring buffer
+# --------------------------------------
+    def _push_head(self, position):
+        """Add a new head segment in front of the current one."""
+        if self._length == len(self._ring):
+            self._grow_ring()
+        self._head_index = (self._head_index - 1) % len(self._ring)
+        self._ring[self._head_index] = position
+        self._length += 1
+        self._change_occupancy(position, 1)
+
+
+    def _pop_tail(self):
+        """Remove the tail segment and release its cell."""
+        tail_index = (self._head_index + self._length - 1) % len(self._ring)
+        position = self._ring[tail_index]
+        self._ring[tail_index] = None
+        self._length -= 1
+        self._change_occupancy(position, -1)
+
+
+    def _change_occupancy(self, position, delta):
+        """Adjust the occupancy count of a position and keep the free cells and mask in sync."""
+        x, y = position
+        if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
+            cell = y * self.grid_width + x
+            count = self._occupancy[cell] + delta
+            self._occupancy[cell] = count
+            if count == 0:
+                self.free_cells.add(cell)
+                self.occupied_mask ^= 1 << cell
+            elif count == 1 and delta > 0:
+                self.free_cells.remove(cell)
+                self.occupied_mask |= 1 << cell
+        else:
+            self._outside += delta
+
+
+    def _grow_ring(self):
+        """Double the ring capacity, only needed when peaceful mode overlaps push the length past the grid size."""
+        segments = list(self.body)
+        self._ring = segments + [None] * len(segments)
+        self._head_index = 0
+
+
+#endregion
+################################################################################
+#region FoodSpawner
+
+
+class FoodSpawner:
+    """
+    Handle the food state without any rendering.
+
+    Attributes:
+        position (tuple): The position of the food, None once the snake covers the whole board.
+        rng (random.Random): The random number generator used for placement.
+
+    Methods:
+        random_position: Generate a random position for the food.
+        respawn: Move the food to a new random position.
+    """
+
+    def __init__(self, snake, rng=None):
+        self.rng = rng if rng is not None else random.Random()
+        self.position = self.random_position(snake)
+
+
+    def random_position(self, snake):
+        """Generate a random position for the food, not on the snake. Returns None if the board is full."""
+        return snake.free_cells.sample(self.rng)
+
+
+    def respawn(self, snake):
+        """Move the food to a new random position."""
+        self.position = self.random_position(snake)
+
+
+#endregion
+################################################################################
+#region Simulation
+
+
+class Simulation:
+    """
+    Advance a single game by one tick at a time.
+
+    Attributes:
+        snake (SnakeBody): The snake state.
+        food (FoodSpawner): The food state.
+        collision_detector (CollisionDetection): The collision detection handler.
+        peaceful_mode (bool): Whether the snake wraps around the edges and ignores itself.
+        alive (bool): Whether the snake is still alive.
+        death_cause (StepEvent): The event that ended the game, if any.
+        won (bool): Whether the snake filled the board.
+        ticks (int): The number of steps taken.
+        food_eaten (int): The number of food items eaten.
+
+    Methods:
+        step: Advance the game by one tick and return the events that occurred.
+    """
+
+    def __init__(self, snake=None, food=None, collision_detector=None, peaceful_mode=False, rng=None):
+        self.collision_detector = collision_detector or CollisionDetection(GRID_WIDTH, GRID_HEIGHT)
+        self.snake = snake or SnakeBody(grid_width=self.collision_detector.grid_width, grid_height=self.collision_detector.grid_height)
+        self.food = food or FoodSpawner(self.snake, rng)
+        self.peaceful_mode = peaceful_mode
+        self.alive = True
+        self.death_cause = None
+        self.won = False
+        self.ticks = 0
+        self.food_eaten = 0
+
+
+    def step(self, direction=None):
+        """Advance the game by one tick and return the events that occurred."""
+        if direction is not None:
+            self.snake.direction = direction
+        self.snake.move(self.peaceful_mode)
+        self.ticks += 1
+        head = self.snake.body[0]
+        if self.collision_detector.check_wall_collision(head, self.peaceful_mode):
+            return self._die(StepEvent.DIED_WALL)
+        if self.collision_detector.check_self_collision(self.snake, self.peaceful_mode):
+            return self._die(StepEvent.DIED_SELF)
+        if self.collision_detector.check_food_collision(head, self.food.position):
+            self.snake.grow()
+            self.food_eaten += 1
+            self.food.respawn(self.snake)
+            if self.food.position is None:
+                self.alive = False
+                self.won = True
+                return [StepEvent.MOVED, StepEvent.ATE, StepEvent.WON]
+            return [StepEvent.MOVED, StepEvent.ATE]
+        return [StepEvent.MOVED]
+
+
+    def _die(self, cause):
+        """Mark the snake as dead and return the death event."""
+        self.alive = False
+        self.death_cause = cause
+        return [cause]
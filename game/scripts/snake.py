@@ -2,12 +2,10 @@
 #region Imports
 
 
-# Third Party
-import pygame
-
-
 # Local
-from scripts.constants import RIGHT, CELL_SIZE, BORDER_THICKNESS, GRID_WIDTH, GRID_HEIGHT
+from scripts.constants import CELL_SIZE, BORDER_THICKNESS
+from scripts.cell_atlas import CELL_ATLAS
+from scripts.simulation import SnakeBody
 
 
 #endregion
@@ -15,10 +13,13 @@ from scripts.constants import RIGHT, CELL_SIZE, BORDER_THICKNESS, GRID_WIDTH, GR
 #region Snake (Player)
 
 
-class Snake:
+class Snake(SnakeBody):
     """
     Handles the snake object for the game.
 
+    The movement rules live in SnakeBody, this class adds the theme and drawing.
+    The gradient colors and cell tiles come from the shared CELL_ATLAS.
+
     Attributes:
         body (list): The list of body segments.
         direction (tuple): The current direction the snake is moving.
@@ -31,64 +32,35 @@ class Snake:
         draw: Draw the snake on the screen.
         draw_snake_body: Draw the snake body on the screen.
         draw_snake_head: Draw the snake head on the screen.
-        _blend_colors: Blend two colors together by a factor.
+        cell_colors: Record the color draw gives each cell of the snake.
 
     """
 
     def __init__(self, theme):
-        self.body = [(10, 10)]
-        self.direction = RIGHT
-        self.growing = False
+        super().__init__()
         self.theme = theme
 
 
-    def move(self, peaceful_mode=False):
-        """Move snake by one step."""
-        new_head = (self.body[0][0] + self.direction[0], self.body[0][1] + self.direction[1])
-        if peaceful_mode:
-            new_head = (new_head[0] % GRID_WIDTH, new_head[1] % GRID_HEIGHT)
-        self.body.insert(0, new_head)
-        if not self.growing:
-            self.body.pop()
-        else:
-            self.growing = False
-
-
-    def grow(self):
-        """Grow the snake by one segment."""
-        self.growing = True
-
-
     def draw(self, surface):
-        """Draw the snake on the screen."""
-        self.draw_snake_body(surface)
-        self.draw_snake_head(surface)  # Draw head last so it's always on top
+        """Draw the snake on the screen with one blits() call, head last so it's always on top."""
+        CELL_ATLAS.draw(surface, self)
 
 
     def draw_snake_body(self, surface):
         """Draw the snake body."""
-        if len(self.body) > 1:
-            # Draw segments in reverse order so later segments appear on top
-            for i, segment in enumerate(reversed(self.body[1:])):
-                x, y = segment
-                # Calculate gradient from tail to neck
-                gradient_factor = (len(self.body) - 2 - i) / (len(self.body) - 1)
-                body_color = self._blend_colors(self.theme.body_color, self.theme.tail_color, gradient_factor)
-                pygame.draw.rect(surface, body_color, pygame.Rect(x * CELL_SIZE + BORDER_THICKNESS, y * CELL_SIZE + BORDER_THICKNESS, CELL_SIZE, CELL_SIZE))
+        # Segments are drawn in reverse order so later segments appear on top
+        surface.blits(CELL_ATLAS.board_blits(self)[:-1], False)
 
 
     def draw_snake_head(self, surface):
         """Draw the snake head."""
-        head = self.body[0]
-        x, y = head
-        pygame.draw.rect(surface, self.theme.head_color, pygame.Rect(x * CELL_SIZE + BORDER_THICKNESS, y * CELL_SIZE + BORDER_THICKNESS, CELL_SIZE, CELL_SIZE))
-
-
-    def _blend_colors(self, color1, color2, factor):
-        """Blend two colors together by a factor (0 to 1)."""
-        r1, g1, b1 = color1
-        r2, g2, b2 = color2
-        r = int(r1 + (r2 - r1) * factor)
-        g = int(g1 + (g2 - g1) * factor)
-        b = int(b1 + (b2 - b1) * factor)
-        return r, g, b
+        x, y = self.body[0]
+        surface.blit(CELL_ATLAS.tile(self.theme.head_color), (x * CELL_SIZE + BORDER_THICKNESS, y * CELL_SIZE + BORDER_THICKNESS))
+
+
+    def cell_colors(self, colors):
+        """Record the color draw gives each cell in a {position: color} dict, later segments overwriting earlier ones."""
+        gradient = CELL_ATLAS.gradient_colors(self.theme, len(self.body))
+        for color, segment in zip(reversed(gradient), reversed(self.body)):
+            colors[segment] = color
+        return colors
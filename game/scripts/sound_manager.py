@@ -1,15 +1,27 @@
+import io
 import os
 import pygame
 import random
+import threading
+
+from scripts import metrics
 
 
 FADE_MS = 1000
+# Posted by the mixer when a track ends, and by the prefetch thread when a retried track is ready
+MUSIC_END_EVENT = pygame.USEREVENT + 1
+# The music folder ships next to the scripts package, wherever the game is started from
+MUSIC_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "music")
 
 
 class SoundManager:
     """
     Handles the game background music.
 
+    While a track plays, a background thread picks the next one and reads it
+    into memory, so a track change only decodes from that buffer and never
+    touches the disk on the frame.
+
     Attributes:
         music_folder (str): The path to the music folder
         tracks (List[str]): A list of music tracks
@@ -17,6 +29,7 @@ class SoundManager:
         playing (bool): Whether music is currently playing
         remaining_tracks (List[str]): Tracks yet to be played
         volume (float): Current volume level (0.0 to 1.0)
+        prefetch_waits (int): Track changes that had to wait for the prefetch to finish
 
     Methods:
         start_music: Start playing music with optional fade-in
@@ -27,10 +40,10 @@ class SoundManager:
         stop_music: Stop the currently playing music with optional fade-out
     """
 
-    def __init__(self, music_folder="game\music"):
-        """Initialize the sound manager with optional custom music folder."""
+    def __init__(self, music_folder=None):
+        """Initialize the sound manager with optional custom music folder, defaulting to the game's music folder."""
         pygame.mixer.init()
-        self.music_folder = music_folder
+        self.music_folder = music_folder if music_folder is not None else MUSIC_FOLDER
         self.tracks = []
         self.current_track = 0
         self.playing = False
@@ -38,6 +51,11 @@ class SoundManager:
         self.volume = 1.0
         self.last_played_track = None
         self.play_count = {}
+        self.prefetch_waits = 0
+        self._failed_tracks = 0
+        self._prefetch_thread = None
+        self._prefetched = None
+        self._playing_buffer = None
         self._load_music_tracks()
         self._setup_events()
         pygame.mixer.music.set_volume(self.volume)
@@ -59,7 +77,7 @@ class SoundManager:
 
     def _setup_events(self):
         """Set up the end of track event handler."""
-        pygame.mixer.music.set_endevent(pygame.USEREVENT + 1)
+        pygame.mixer.music.set_endevent(MUSIC_END_EVENT)
 
 
     def _reset_playlist(self):
@@ -81,6 +99,7 @@ class SoundManager:
         try:
             first_track = self.tracks[0]
             pygame.mixer.music.load(first_track)
+            metrics.MUSIC_TRACK_LOADS.inc()
             pygame.mixer.music.play(fade_ms=fade_ms)
             self.playing = True
             self.last_played_track = first_track
@@ -89,28 +108,95 @@ class SoundManager:
         except pygame.error as e:
             print(f"Error playing music: {e}")
             self.playing = False
+            return
+        self._start_prefetch()
 
 
     def handle_music_end(self, fade_ms=FADE_MS):
-        """Handle the end of a track with optional fade-in."""
+        """
+        Handle the end of a track with optional fade-in, playing the prefetched track.
+
+        A track that cannot be read or played is skipped: the next one is read
+        on the prefetch thread, which posts the end of track event again once it
+        is ready. The music only stops once every track has failed in a row.
+        """
         if not self.playing:
             return
-        if not self.remaining_tracks:
-            self._reset_playlist()
-        try:
-            next_track = self.remaining_tracks.pop()
-            # Ensure we don't play the same track twice in a row
-            while next_track == self.last_played_track and self.remaining_tracks:
-                self.remaining_tracks.append(next_track)
-                next_track = self.remaining_tracks.pop()
+        next_track, buffer = self._take_prefetched()
+        if buffer is not None and self._play_buffer(next_track, buffer, fade_ms):
+            self._failed_tracks = 0
+            self._start_prefetch()
+            return
+        self._failed_tracks += 1
+        if self._failed_tracks >= len(self.tracks):
+            self._failed_tracks = 0
+            self.playing = False
+            return
+        self._start_prefetch(notify=True)
 
-            pygame.mixer.music.load(next_track)
+
+    def _play_buffer(self, track, buffer, fade_ms):
+        """Play a track read into memory, returning whether it started."""
+        try:
+            pygame.mixer.music.load(buffer, os.path.splitext(track)[1][1:])
+            metrics.MUSIC_TRACK_LOADS.inc()
             pygame.mixer.music.play(fade_ms=fade_ms)
-            self.last_played_track = next_track
-            self.play_count[next_track] += 1
         except pygame.error as e:
             print(f"Error playing next track: {e}")
-            self.playing = False
+            return False
+        # The mixer streams from the buffer, so it has to outlive the track
+        self._playing_buffer = buffer
+        self.last_played_track = track
+        self.play_count[track] += 1
+        return True
+
+
+# --------------------------------------
+# Prefetch
+# --------------------------------------
+    def _pick_next_track(self):
+        """Pick the track to play after the current one."""
+        if not self.remaining_tracks:
+            self._reset_playlist()
+        next_track = self.remaining_tracks.pop()
+        # Ensure we don't play the same track twice in a row
+        if next_track == self.last_played_track and self.remaining_tracks:
+            self.remaining_tracks.insert(0, next_track)
+            next_track = self.remaining_tracks.pop()
+        return next_track
+
+
+    def _start_prefetch(self, notify=False):
+        """Pick and read the next track on a background thread, posting the end of track event when done if notify is set."""
+        self._prefetched = None
+        self._prefetch_thread = threading.Thread(target=self._prefetch, args=(notify,), name="music-prefetch", daemon=True)
+        self._prefetch_thread.start()
+
+
+    def _prefetch(self, notify):
+        next_track = self._pick_next_track()
+        try:
+            with open(next_track, 'rb') as f:
+                buffer = io.BytesIO(f.read())
+        except OSError as e:
+            print(f"Error reading next track: {e}")
+            buffer = None
+        self._prefetched = (next_track, buffer)
+        if notify:
+            pygame.event.post(pygame.event.Event(MUSIC_END_EVENT))
+
+
+    def _take_prefetched(self):
+        """Return the prefetched (track, buffer), waiting for the prefetch if it has not finished."""
+        if self._prefetch_thread is None:
+            self._start_prefetch()
+        # Only a read still in progress is a wait, the thread may linger a moment after posting its event
+        if self._prefetched is None:
+            self.prefetch_waits += 1
+            metrics.MUSIC_PREFETCH_WAITS.inc()
+        self._prefetch_thread.join()
+        self._prefetch_thread = None
+        return self._prefetched
 
 
     def set_volume(self, volume):
@@ -0,0 +1,98 @@
+"""
+
+This module contains the trace of how long each startup phase takes.
+
+Startup calls lap() after each phase, up to the first frame on screen. Work
+moved to background threads is recorded with its own duration, since it
+overlaps the phases. It does not depend on pygame.
+
+
+Classes:
+    StartupTrace: Class for timing the startup phases up to the first frame.
+
+"""
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import time
+import threading
+
+
+#endregion
+################################################################################
+#region StartupTrace
+
+
+class StartupTrace:
+    """
+    Time the startup phases up to the first frame.
+
+    Attributes:
+        started (float): The clock reading startup is timed from.
+        phases (list): (name, seconds) of each phase, in order.
+        background (list): (name, seconds) of each background task that finished.
+        finished (bool): Whether the first frame was shown.
+        output (file): Where the report is printed, None to keep it silent.
+
+    Methods:
+        lap: Record the time since the last lap as a phase.
+        record_background: Record how long a background task took.
+        finish: Record the last phase and print the report.
+        total: Return the seconds from the start to the last lap.
+        report: Return the phases as text, one per line.
+    """
+
+    def __init__(self, started=None, output=None, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock() if started is None else started
+        self.phases = []
+        self.background = []
+        self.finished = False
+        self.output = output
+        self._last = self.started
+        self._lock = threading.Lock()
+
+
+    def lap(self, name):
+        """Record the time since the last lap as a phase."""
+        now = self.clock()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+
+    def record_background(self, name, seconds):
+        """Record how long a background task took, printing it now if the report was already printed."""
+        with self._lock:
+            self.background.append((name, seconds))
+            late = self.finished
+        if late and self.output:
+            print(f"startup (background) {name}: {seconds * 1000:.1f} ms", file=self.output)
+
+
+    def finish(self, name="first_frame"):
+        """Record the last phase, up to the first frame on screen, and print the report."""
+        self.lap(name)
+        with self._lock:
+            self.finished = True
+        if self.output:
+            print(self.report(), file=self.output)
+
+
+    def total(self):
+        """Return the seconds from the start to the last lap."""
+        return self._last - self.started
+
+
+    def report(self):
+        """Return the phases, the total and the finished background tasks as text, one per line."""
+        lines = [f"startup {name}: {seconds * 1000:.1f} ms" for name, seconds in self.phases]
+        lines.append(f"startup total: {self.total() * 1000:.1f} ms")
+        with self._lock:
+            lines.extend(f"startup (background) {name}: {seconds * 1000:.1f} ms" for name, seconds in self.background)
+        return "\n".join(lines)
+
+
+#endregion
@@ -0,0 +1,211 @@
+"""
+Play seeded autopilot games without a display and report how the strategy did.
+
+Games run across a process pool on the headless simulation, so thousands of
+games take seconds to minutes instead of hours of watching the menu demo.
+
+Usage (from the game folder):
+    python tournament.py --strategy bfs --games 1000 --width 36 --height 24
+    python tournament.py --strategy hamiltonian --mode peaceful --format csv --output results.csv
+"""
+
+
+################################################################################
+#region Imports
+
+
+# Standard Library
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import random
+import sys
+import time
+from array import array
+
+
+# Local
+from scripts.constants import GRID_WIDTH, GRID_HEIGHT, AUTOPILOT_STRATEGY
+from scripts.collision_detection import CollisionDetection
+from scripts.hamiltonian import HamiltonianCycle
+from scripts.navigation import available_strategies, create_strategy, deadline_after
+from scripts.simulation import SnakeBody, Simulation, StepEvent
+
+
+#endregion
+################################################################################
+#region Game
+
+
+OUTCOMES = {
+    StepEvent.DIED_WALL: "wall",
+    StepEvent.DIED_SELF: "self",
+    StepEvent.WON: "won",
+}
+GAME_FIELDS = ["seed", "length", "ticks", "outcome", "decisions", "decision_seconds", "incomplete_plans", "nodes_expanded"]
+
+
+def play_game(job):
+    """
+    Play one seeded game to the end and return its results.
+
+    Args:
+        job (tuple): (strategy, width, height, peaceful, seed, max_ticks, budget).
+
+    Returns:
+        tuple: The game's results as a dict, and its decision latencies in seconds as an array.
+    """
+    strategy_name, width, height, peaceful, seed, max_ticks, budget = job
+    collision_detector = CollisionDetection(width, height)
+    snake = SnakeBody(start=(min(10, width // 2), min(10, height // 2)), grid_width=width, grid_height=height)
+    simulation = Simulation(snake, collision_detector=collision_detector, peaceful_mode=peaceful, rng=random.Random(seed))
+    strategy = create_strategy(strategy_name, snake, collision_detector)
+    strategy.peaceful_mode = peaceful
+    latencies = array("d")
+    clock = time.perf_counter
+    while simulation.alive and simulation.ticks < max_ticks:
+        started = clock()
+        plan = strategy.plan(simulation.food.position, deadline_after(budget))
+        latencies.append(clock() - started)
+        if plan.direction:
+            snake.direction = plan.direction
+        simulation.step()
+    if simulation.won:
+        outcome = OUTCOMES[StepEvent.WON]
+    elif simulation.death_cause is not None:
+        outcome = OUTCOMES[simulation.death_cause]
+    else:
+        outcome = "timeout"
+    result = {
+        "seed": seed,
+        "length": len(snake.body),
+        "ticks": simulation.ticks,
+        "outcome": outcome,
+        "decisions": len(latencies),
+        "decision_seconds": sum(latencies),
+        "incomplete_plans": strategy.incomplete_plans,
+        "nodes_expanded": strategy.nodes_expanded,
+    }
+    return result, latencies
+
+
+#endregion
+################################################################################
+#region Report
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted sequence, 0.0 if it is empty."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def summarize(games, latencies):
+    """Return the aggregate results of a tournament."""
+    count = len(games)
+    lengths = sorted(game["length"] for game in games)
+    outcomes = {}
+    for game in games:
+        outcomes[game["outcome"]] = outcomes.get(game["outcome"], 0) + 1
+    decision_seconds = sum(game["decision_seconds"] for game in games)
+    decisions = sum(game["decisions"] for game in games)
+    latencies = sorted(latencies)
+    return {
+        "games": count,
+        "mean_length": sum(lengths) / count if count else 0.0,
+        "median_length": percentile(lengths, 0.5),
+        "max_length": lengths[-1] if lengths else 0,
+        "mean_ticks": sum(game["ticks"] for game in games) / count if count else 0.0,
+        "outcomes": outcomes,
+        "decisions": decisions,
+        "decisions_per_second": decisions / decision_seconds if decision_seconds else 0.0,
+        "p50_decision_ms": percentile(latencies, 0.5) * 1000,
+        "p99_decision_ms": percentile(latencies, 0.99) * 1000,
+        "incomplete_plans": sum(game["incomplete_plans"] for game in games),
+    }
+
+
+def format_report(config, summary, games, output_format):
+    """
+    Return the report as JSON (config, summary and games) or CSV.
+
+    The CSV has one row per game, then a blank row and a (summary, value) table
+    with one row per summary field and one per outcome.
+    """
+    if output_format == "json":
+        return json.dumps({"config": config, "summary": summary, "games": games}, indent=2)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=GAME_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(games)
+    footer = csv.writer(buffer, lineterminator="\n")
+    footer.writerow([])
+    footer.writerow(["summary", "value"])
+    for name, value in summary.items():
+        if name == "outcomes":
+            footer.writerows((f"outcome_{outcome}", count) for outcome, count in sorted(value.items()))
+        else:
+            footer.writerow([name, value])
+    return buffer.getvalue()
+
+
+#endregion
+################################################################################
+#region Main
+
+
+def parse_args(argv=None):
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description="Play seeded autopilot games without a display and report the results.")
+    parser.add_argument("--strategy", default=AUTOPILOT_STRATEGY, choices=available_strategies(), help="autopilot strategy to play")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--width", type=int, default=GRID_WIDTH, help="grid width in cells")
+    parser.add_argument("--height", type=int, default=GRID_HEIGHT, help="grid height in cells")
+    parser.add_argument("--mode", choices=["classic", "peaceful"], default="classic", help="game mode")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game, game i uses seed + i")
+    parser.add_argument("--max-ticks", type=int, default=None, help="end a game after this many ticks (default: 50 per grid cell)")
+    parser.add_argument("--budget", type=float, default=None, help="seconds each decision may take (default: no limit)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--format", choices=["json", "csv"], default="json", help="report format")
+    parser.add_argument("--output", default=None, help="file to write the report to (default: stdout)")
+    args = parser.parse_args(argv)
+    if args.strategy == "hamiltonian" and not HamiltonianCycle.exists(args.width, args.height):
+        parser.error(f"No Hamiltonian cycle exists on a {args.width}x{args.height} grid, --width or --height must be even")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    max_ticks = args.max_ticks or 50 * args.width * args.height
+    peaceful = args.mode == "peaceful"
+    jobs = [(args.strategy, args.width, args.height, peaceful, args.seed + i, max_ticks, args.budget) for i in range(args.games)]
+    games = []
+    latencies = array("d")
+    started = time.perf_counter()
+    with multiprocessing.Pool(args.workers) as pool:
+        for result, game_latencies in pool.imap_unordered(play_game, jobs, chunksize=max(1, len(jobs) // 64)):
+            games.append(result)
+            latencies.extend(game_latencies)
+    games.sort(key=lambda game: game["seed"])
+    config = vars(args) | {"max_ticks": max_ticks, "wall_seconds": time.perf_counter() - started}
+    summary = summarize(games, latencies)
+    report = format_report(config, summary, games, args.format)
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            f.write(report)
+    else:
+        sys.stdout.write(report + ("" if report.endswith("\n") else "\n"))
+    print(f"{summary['games']} games, mean length {summary['mean_length']:.1f}, outcomes {summary['outcomes']}, "
+          f"{summary['decisions_per_second']:.0f} decisions/s, p50 {summary['p50_decision_ms']:.3f} ms, "
+          f"p99 {summary['p99_decision_ms']:.3f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
+
+
+#endregion